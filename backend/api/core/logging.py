@@ -1,21 +1,28 @@
 """Structured logging configuration"""
+import atexit
 import logging
+import queue
 import sys
 import json
-from datetime import datetime
-from typing import Any, Dict
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
 from contextvars import ContextVar
 
 # Context variable for request_id
 request_id_ctx: ContextVar[str] = ContextVar("request_id", default="")
 
+# Background listener that performs the actual log I/O
+_queue_listener: Optional[QueueListener] = None
+
 
 class StructuredFormatter(logging.Formatter):
     """Format logs as structured JSON"""
 
     def format(self, record: logging.LogRecord) -> str:
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            # Time the record was created, not when it is formatted
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -37,20 +44,43 @@ class StructuredFormatter(logging.Formatter):
         return json.dumps(log_data)
 
 
+def _stop_queue_listener():
+    """Flush and stop the background log listener if running"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
 def setup_logging(log_level: str = "INFO"):
     """Setup structured logging"""
+    global _queue_listener
 
     # Remove existing handlers
     root_logger = logging.getLogger()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
-    # Create console handler with structured formatter
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(StructuredFormatter())
+    _stop_queue_listener()
+
+    # Write logs from a background thread so request handlers never block on
+    # stdout. The QueueHandler formats each record in the emitting thread (as
+    # the stdlib prepare() does), so the request_id context and the message
+    # args are captured there; the listener only writes the finished line.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(StructuredFormatter())
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter("%(message)s"))
+    _queue_listener = QueueListener(log_queue, console_handler)
+    _queue_listener.start()
 
     # Configure root logger
-    root_logger.addHandler(handler)
+    root_logger.addHandler(queue_handler)
     root_logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
 
     # Reduce noise from third-party libraries
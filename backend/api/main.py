@@ -1,6 +1,7 @@
 """FastAPI main application"""
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import uuid
 import time
@@ -10,6 +11,7 @@ from .core.config import get_settings
 from .core.logging import setup_logging, request_id_ctx
 from .core.errors import api_error_handler, general_exception_handler, APIError
 from .store.database import init_db, dispose_db
+from .services.chat import close_http_client
 from .routes import health, threads, messages, agents
 from .routes import stream as stream_routes
 
@@ -33,6 +35,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down...")
+    close_http_client()
     dispose_db()
 
 
@@ -41,12 +44,14 @@ app = FastAPI(
     title=settings.api_title,
     version=settings.api_version,
     lifespan=lifespan,
+    # Serialize JSON responses with orjson instead of the stdlib json module
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Für POC - alle Origins erlauben
+    allow_origins=settings.allowed_origins_set,  # Für POC standardmäßig "*" (alle Origins)
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -8,7 +8,7 @@ router = APIRouter(prefix="/agents", tags=["agents"])
 
 
 @router.get("", response_model=AgentListResponse)
-async def list_agents():
+def list_agents():
     """List available agents"""
     agents = get_available_agents()
     return AgentListResponse(
@@ -1,38 +1,44 @@
 """Health check routes"""
-from fastapi import APIRouter
-from datetime import datetime
+import asyncio
+from fastapi import APIRouter, Depends
+from datetime import datetime, timezone
 from sqlalchemy import text
 
 from ..schemas.schemas import HealthResponse, ReadinessResponse
-from ..core.config import get_settings
+from ..core.config import Settings, get_settings
 from ..store.database import engine
 
 router = APIRouter()
-settings = get_settings()
 
 
 @router.get("/healthz", response_model=HealthResponse)
-async def health_check():
+async def health_check(settings: Settings = Depends(get_settings)):
     """Health check endpoint"""
     return HealthResponse(
         status="healthy",
         version=settings.api_version,
-        timestamp=datetime.utcnow()
+        timestamp=datetime.now(timezone.utc)
     )
 
 
+def _check_database() -> bool:
+    """Check database connection (blocking)"""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
+
 @router.get("/readyz", response_model=ReadinessResponse)
 async def readiness_check():
     """Readiness check endpoint"""
     checks = {}
 
-    # Check database connection
-    try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        checks["database"] = True
-    except Exception:
-        checks["database"] = False
+    # Check database connection in a worker thread so a slow or unreachable
+    # database does not block the event loop
+    checks["database"] = await asyncio.to_thread(_check_database)
 
     ready = all(checks.values()) if checks else False
 
@@ -43,7 +49,7 @@ async def readiness_check():
 
 
 @router.get("/version")
-async def version():
+async def version(settings: Settings = Depends(get_settings)):
     """Version endpoint"""
     return {
         "version": settings.api_version,
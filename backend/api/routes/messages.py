@@ -1,10 +1,11 @@
 """Message management routes"""
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
+from contextlib import aclosing
 from typing import Optional, AsyncIterator
 from uuid import UUID
 from sqlalchemy.orm import Session
-import json
+import orjson
 import asyncio
 import logging
 
@@ -17,15 +18,17 @@ from ..schemas.schemas import (
 from ..store.database import get_db
 from ..store.repository import ThreadRepository, MessageRepository
 from ..store.models import MessageRole
-from ..services.chat import run_agent
+from ..services.chat import SSE_KEEPALIVE, run_agent, run_agent_with_keepalive
 from ..core.errors import ValidationError
+from ..core.config import get_settings
 
 router = APIRouter(prefix="/threads/{thread_id}/messages", tags=["messages"])
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
 @router.get("", response_model=MessageListResponse)
-async def list_messages(
+def list_messages(
     thread_id: UUID,
     limit: Optional[int] = Query(default=None, ge=1, le=1000),
     before_id: Optional[int] = Query(default=None),
@@ -83,15 +86,11 @@ async def _create_message_non_stream(
     thread_repo = ThreadRepository(db)
     thread_repo.get_by_id_or_raise(thread_id)
 
-    # Get message history
+    # Get message history in agent message format
     msg_repo = MessageRepository(db)
-    history = msg_repo.list_by_thread(thread_id)
-
-    # Convert to agent message format
-    agent_messages = [
-        {"role": msg.role.value, "content": msg.content}
-        for msg in history
-    ]
+    agent_messages = msg_repo.list_history(
+        thread_id, limit=settings.agent_history_max_messages
+    )
 
     # Add new user message
     agent_messages.append({
@@ -108,7 +107,8 @@ async def _create_message_non_stream(
 
     # Call agent
     try:
-        result = run_agent(
+        result = await asyncio.to_thread(
+            run_agent,
             agent=message_data.agent,
             messages=agent_messages,
             params=message_data.params,
@@ -149,7 +149,7 @@ async def _stream_message_response(
     thread_id: UUID,
     message_data: MessageCreate,
     db: Session
-) -> AsyncIterator[str]:
+) -> AsyncIterator[bytes]:
     """Handle streaming message creation with SSE"""
 
     try:
@@ -157,15 +157,11 @@ async def _stream_message_response(
         thread_repo = ThreadRepository(db)
         thread_repo.get_by_id_or_raise(thread_id)
 
-        # Get message history
+        # Get message history in agent message format
         msg_repo = MessageRepository(db)
-        history = msg_repo.list_by_thread(thread_id)
-
-        # Convert to agent message format
-        agent_messages = [
-            {"role": msg.role.value, "content": msg.content}
-            for msg in history
-        ]
+        agent_messages = msg_repo.list_history(
+            thread_id, limit=settings.agent_history_max_messages
+        )
 
         # Add new user message
         agent_messages.append({
@@ -189,19 +185,28 @@ async def _stream_message_response(
 
         # For now, streaming is not fully implemented in agents
         # So we fall back to non-streaming and send the complete response
-        result = run_agent(
+        # Run the agent in a worker thread, sending keep-alive comments
+        # while it works
+        async with aclosing(run_agent_with_keepalive(
+            settings.sse_keepalive_seconds,
             agent=message_data.agent,
             messages=agent_messages,
             params=message_data.params,
-            stream=False
-        )
+            stream=False,
+        )) as agent_events:
+            async for event in agent_events:
+                if event is SSE_KEEPALIVE:
+                    yield event
+                else:
+                    result = event
 
         # Simulate token streaming by splitting the response
         content = result["content"]
-        for i in range(0, len(content), 10):  # Send 10 chars at a time
-            chunk = content[i:i+10]
+        chunk_size = settings.sse_token_chunk_chars
+        for i in range(0, len(content), chunk_size):
+            chunk = content[i:i+chunk_size]
             yield _format_sse_event("token", {"token": chunk})
-            await asyncio.sleep(0.01)  # Small delay for realistic streaming
+            await asyncio.sleep(settings.sse_token_flush_seconds)
 
         # Send usage if available
         if result.get("usage"):
@@ -241,6 +246,6 @@ async def _stream_message_response(
         })
 
 
-def _format_sse_event(event_type: str, data: dict) -> str:
-    """Format data as Server-Sent Event"""
-    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+def _format_sse_event(event_type: str, data: dict) -> bytes:
+    """Format data as Server-Sent Event (bytes, so StreamingResponse sends it as-is)"""
+    return b"event: " + event_type.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
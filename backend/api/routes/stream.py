@@ -2,19 +2,22 @@
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from contextlib import aclosing
 from typing import Optional, AsyncIterator
 from sqlalchemy.orm import Session
-import json
+import orjson
 import asyncio
 import logging
 
 from ..store.database import get_db
 from ..store.repository import ThreadRepository, MessageRepository
 from ..store.models import MessageRole
-from ..services.chat import run_agent
+from ..services.chat import SSE_KEEPALIVE, run_agent_with_keepalive
+from ..core.config import get_settings
 
 router = APIRouter(prefix="/stream", tags=["stream"])
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
 class StreamChatRequest(BaseModel):
@@ -34,7 +37,7 @@ class StreamChatMetadata(BaseModel):
 async def _stream_chat_response(
     request: StreamChatRequest,
     db: Session
-) -> AsyncIterator[str]:
+) -> AsyncIterator[bytes]:
     """Generate SSE stream for chat response"""
 
     try:
@@ -62,14 +65,10 @@ async def _stream_chat_response(
             "thread_id": str(thread_id)
         })
 
-        # Get message history
-        history = msg_repo.list_by_thread(thread_id)
-
-        # Convert to agent message format
-        agent_messages = [
-            {"role": msg.role.value, "content": msg.content}
-            for msg in history
-        ]
+        # Get message history in agent message format
+        agent_messages = msg_repo.list_history(
+            thread_id, limit=settings.agent_history_max_messages
+        )
 
         # Add new user message
         agent_messages.append({
@@ -101,12 +100,20 @@ async def _stream_chat_response(
         agent_params["thread_id"] = str(thread_id)
 
         try:
-            result = run_agent(
+            # Run the agent in a worker thread, sending keep-alive comments
+            # while it works
+            async with aclosing(run_agent_with_keepalive(
+                settings.sse_keepalive_seconds,
                 agent=request.agent,
                 messages=agent_messages,
                 params=agent_params,
-                stream=False
-            )
+                stream=False,
+            )) as agent_events:
+                async for event in agent_events:
+                    if event is SSE_KEEPALIVE:
+                        yield event
+                    else:
+                        result = event
 
             # Persist assistant message BEFORE streaming
             # This ensures the message is saved even if streaming is interrupted
@@ -134,12 +141,12 @@ async def _stream_chat_response(
             # Thinking done
             yield _format_sse_event("thinking", {"status": "done"})
 
-            # Stream tokens in chunks for UI effect
-            chunk_size = 5  # Characters per chunk
+            # Stream tokens in batched chunks for UI effect
+            chunk_size = settings.sse_token_chunk_chars
             for i in range(0, len(content), chunk_size):
                 chunk = content[i:i+chunk_size]
                 yield _format_sse_event("token", {"token": chunk})
-                await asyncio.sleep(0.02)  # Small delay for realistic streaming
+                await asyncio.sleep(settings.sse_token_flush_seconds)
 
             # Send usage if available
             if result.get("usage"):
@@ -168,9 +175,9 @@ async def _stream_chat_response(
         })
 
 
-def _format_sse_event(event_type: str, data: dict) -> str:
-    """Format data as Server-Sent Event"""
-    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+def _format_sse_event(event_type: str, data: dict) -> bytes:
+    """Format data as Server-Sent Event (bytes, so StreamingResponse sends it as-is)"""
+    return b"event: " + event_type.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
 
 
 @router.post("/chat")
@@ -15,9 +15,12 @@ from ..store.repository import ThreadRepository
 
 router = APIRouter(prefix="/threads", tags=["threads"])
 
+# The handlers use the blocking SQLAlchemy session, so they are plain
+# functions that FastAPI runs in its threadpool instead of on the event loop
+
 
 @router.post("", response_model=ThreadResponse, status_code=201)
-async def create_thread(
+def create_thread(
     thread_data: ThreadCreate,
     db: Session = Depends(get_db)
 ):
@@ -32,7 +35,7 @@ async def create_thread(
 
 
 @router.get("/{thread_id}", response_model=ThreadResponse)
-async def get_thread(
+def get_thread(
     thread_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -43,7 +46,7 @@ async def get_thread(
 
 
 @router.get("", response_model=ThreadListResponse)
-async def list_threads(
+def list_threads(
     limit: int = Query(default=50, ge=1, le=100),
     cursor: Optional[datetime] = Query(default=None),
     db: Session = Depends(get_db)
@@ -64,7 +67,7 @@ async def list_threads(
 
 
 @router.delete("/{thread_id}", status_code=204)
-async def delete_thread(
+def delete_thread(
     thread_id: UUID,
     hard: bool = Query(default=False, description="Hard delete (permanent)"),
     db: Session = Depends(get_db)
@@ -5,6 +5,8 @@ from uuid import UUID
 from pydantic import BaseModel, Field, field_validator
 from enum import Enum
 
+from ..core.config import get_settings
+
 
 # Enums
 class MessageRoleEnum(str, Enum):
@@ -72,8 +74,9 @@ class MessageCreate(BaseModel):
     @classmethod
     def validate_input_size(cls, v: str) -> str:
         """Validate input size"""
-        if len(v.encode('utf-8')) > 16 * 1024:  # 16KB
-            raise ValueError("Input exceeds maximum size of 16KB")
+        settings = get_settings()
+        if len(v.encode('utf-8')) > settings.max_content_size_bytes:
+            raise ValueError(f"Input exceeds maximum size of {settings.max_content_size_kb}KB")
         return v
 
     @field_validator('agent')
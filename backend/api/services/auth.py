@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import Security, HTTPException, status, Request
 from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
 import jwt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from api.core.config import get_settings
 from api.core.errors import UnauthorizedError
@@ -84,7 +84,7 @@ def create_jwt_token(payload: dict, expires_in_hours: int = 24) -> str:
         Encoded JWT token
     """
     payload = payload.copy()
-    payload["exp"] = datetime.utcnow() + timedelta(hours=expires_in_hours)
+    payload["exp"] = datetime.now(timezone.utc) + timedelta(hours=expires_in_hours)
 
     return jwt.encode(
         payload,
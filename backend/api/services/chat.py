@@ -1,8 +1,11 @@
 """Chat service - integrates with agents from langchain_service"""
+import asyncio
 import sys
 import os
-from typing import Dict, List, Any, Iterator, Optional
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Any, Iterator, Optional
 import logging
+import httpx
 
 # Robust: Füge sowohl backend-Root als auch Projekt-Root zum sys.path hinzu
 _THIS_FILE = os.path.abspath(__file__)
@@ -18,6 +21,59 @@ from ..core.config import get_settings
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Connection-pooled HTTP client shared by all Qwen agents for model server calls
+_http_client: Optional[httpx.Client] = None
+
+
+def get_http_client() -> httpx.Client:
+    """Get the shared HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None:
+        # HTTP/2 multiplexes concurrent requests over one connection when the
+        # model server is reached via TLS (plain http stays on HTTP/1.1)
+        _http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=50),
+            timeout=settings.agent_call_timeout_seconds,
+        )
+    return _http_client
+
+
+def close_http_client():
+    """Close the shared HTTP client"""
+    global _http_client
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+    # Cached Qwen agents hold the closed client
+    _get_qwen_agent.cache_clear()
+
+
+# Agents hold no per-request state, so one instance per configuration is
+# reused across requests instead of rebuilding it (and opening a new
+# PostgresSaver connection) for every message. Failed creations are not
+# cached and are retried on the next request.
+@lru_cache(maxsize=2)
+def _get_qwen_agent(enable_thinking: bool):
+    """Get the shared Qwen agent for the given thinking mode"""
+    from langchain_service.qwen_agent_bgb import create_qwen_agent_bgb
+
+    return create_qwen_agent_bgb(
+        enable_thinking=enable_thinking,
+        http_client=get_http_client(),
+        use_semantic_cache=settings.semantic_cache_enabled,
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_gemini_agent():
+    """Get the shared Gemini agent"""
+    _ensure_gemini_env()
+    from langchain_service.gemini_agent_bgb import create_gemini_agent_bgb
+
+    # Gemini modells/params via env handled innerhalb agent
+    return create_gemini_agent_bgb()
+
 
 def _ensure_gemini_env():
     """Ensure GOOGLE_API_KEY is present in process env for Gemini agent."""
@@ -75,17 +131,46 @@ def run_agent(
         )
 
 
+# SSE comment line sent while the agent works, ignored by clients
+SSE_KEEPALIVE = b": keepalive\n\n"
+
+# Lower bound for the keep-alive interval (0 would busy-loop)
+SSE_KEEPALIVE_MIN_SECONDS = 1.0
+
+
+async def run_agent_with_keepalive(
+    keepalive_seconds: float,
+    **agent_kwargs: Any
+) -> AsyncIterator[Any]:
+    """
+    Run run_agent in a worker thread for an SSE response.
+
+    Yields SSE_KEEPALIVE every keepalive_seconds while the agent works, so
+    proxies and clients do not close the idle connection, and finally the
+    agent result. If the consumer stops early (client disconnect), the task
+    is cancelled; the worker thread finishes on its own and its result is
+    discarded.
+    """
+    interval = max(keepalive_seconds, SSE_KEEPALIVE_MIN_SECONDS)
+    task = asyncio.create_task(asyncio.to_thread(run_agent, **agent_kwargs))
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=interval)
+            if done:
+                break
+            yield SSE_KEEPALIVE
+        yield task.result()
+    finally:
+        task.cancel()
+
+
 def _run_qwen_agent(
     messages: List[Dict[str, Any]],
     params: Dict[str, Any],
     stream: bool
 ) -> Dict[str, Any] | Iterator[Dict[str, Any]]:
     """Run Qwen agent"""
-    from langchain_service.qwen_agent_bgb import create_qwen_agent_bgb
-
-    # Create agent
-    enable_thinking = params.get("enable_thinking", True)
-    agent = create_qwen_agent_bgb(enable_thinking=enable_thinking)
+    agent = _get_qwen_agent(bool(params.get("enable_thinking", True)))
 
     # Extract user question from last user message
     user_question = None
@@ -137,11 +222,7 @@ def _run_gemini_agent(
     stream: bool
 ) -> Dict[str, Any] | Iterator[Dict[str, Any]]:
     """Run Gemini agent"""
-    _ensure_gemini_env()
-    from langchain_service.gemini_agent_bgb import create_gemini_agent_bgb
-
-    # Create agent (Gemini modells/params via env handled innerhalb agent)
-    agent = create_gemini_agent_bgb()
+    agent = _get_gemini_agent()
 
     # Extract user question from last user message
     user_question = None
@@ -193,8 +274,7 @@ def get_available_agents() -> List[Dict[str, Any]]:
 
     # Qwen Availability
     try:
-        from langchain_service.qwen_agent_bgb import create_qwen_agent_bgb
-        create_qwen_agent_bgb(enable_thinking=False)
+        _get_qwen_agent(False)
         agents.append({
             "name": "qwen",
             "description": "Qwen-based BGB assistant with function calling",
@@ -216,9 +296,7 @@ def get_available_agents() -> List[Dict[str, Any]]:
         gemini_desc += " (not available: GOOGLE_API_KEY not set)"
     else:
         try:
-            _ensure_gemini_env()
-            from langchain_service.gemini_agent_bgb import create_gemini_agent_bgb
-            create_gemini_agent_bgb()  # will raise if key invalid/missing
+            _get_gemini_agent()  # will raise if key invalid/missing
             gemini_available = True
         except Exception as e:
             logger.warning(f"Gemini agent not available: {e}")
@@ -17,6 +17,7 @@ engine = create_engine(
     max_overflow=settings.db_max_overflow,
     echo=settings.db_echo,
     pool_pre_ping=True,  # Verify connections before using
+    pool_recycle=settings.db_pool_recycle_seconds,  # Avoid server/proxy idle timeouts
 )
 
 # Session factory
@@ -1,5 +1,5 @@
 """Repository pattern for data access"""
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List
 from uuid import UUID
 from sqlalchemy.orm import Session
@@ -79,7 +79,7 @@ class ThreadRepository:
     def soft_delete(self, thread_id: UUID) -> Thread:
         """Soft delete a thread"""
         thread = self.get_by_id_or_raise(thread_id)
-        thread.deleted_at = datetime.utcnow()
+        thread.deleted_at = datetime.now(timezone.utc)
         self.db.flush()
         return thread
 
@@ -92,7 +92,7 @@ class ThreadRepository:
     def update_timestamp(self, thread_id: UUID) -> Thread:
         """Update thread's updated_at timestamp"""
         thread = self.get_by_id_or_raise(thread_id)
-        thread.updated_at = datetime.utcnow()
+        thread.updated_at = datetime.now(timezone.utc)
         self.db.flush()
         return thread
 
@@ -144,6 +144,28 @@ class MessageRepository:
 
         return query.all()
 
+    def list_history(self, thread_id: UUID, limit: Optional[int] = None) -> List[dict]:
+        """
+        List a thread's messages in agent message format (role/content dicts).
+
+        Only the two needed columns are selected, so no Message objects (with
+        their JSONB columns) are loaded into the session. With a limit, only
+        the most recent messages are returned (still oldest first); they are
+        read backwards along ix_messages_thread_id_created_at.
+        """
+        query = (
+            self.db.query(Message.role, Message.content)
+            .filter(Message.thread_id == thread_id)
+        )
+
+        if limit:
+            rows = query.order_by(desc(Message.created_at)).limit(limit).all()
+            rows.reverse()
+        else:
+            rows = query.order_by(Message.created_at)
+
+        return [{"role": role.value, "content": content} for role, content in rows]
+
     def get_by_id(self, message_id: int) -> Optional[Message]:
         """Get message by ID"""
         return self.db.query(Message).filter(Message.id == message_id).first()
@@ -7,14 +7,109 @@ This script loads the BGB TTL file into Blazegraph and sets up SPARQL querying.
 
 import argparse
 import logging
+import re
 import requests
 import sys
 import time
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# rangeCount attribute of Blazegraph's ESTCARD response
+ESTCARD_RE = re.compile(r'rangeCount="(\d+)"')
+
+# (connect, read) timeouts: fail fast when the host is unreachable, but give
+# a reachable server time to answer
+CHECK_TIMEOUT = (1.0, 10.0)
+POLL_TIMEOUT = (1.0, 4.0)
+
+# Query templates. User values are only inserted as escaped literals built by
+# _sparql_literal and as int-cast LIMITs, so the search term cannot alter the
+# structure of the query.
+CONCEPT_QUERY = """
+PREFIX bgb-data: <http://example.org/bgb/data/>
+PREFIX bgb-onto: <http://example.org/bgb/ontology/>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+SELECT ?concept ?label WHERE {
+    ?concept a bgb-onto:LegalConcept ;
+             rdfs:label ?label .
+} LIMIT %d
+"""
+
+PARAGRAPH_QUERY = """
+PREFIX bgb-data: <http://example.org/bgb/data/>
+PREFIX bgb-onto: <http://example.org/bgb/ontology/>
+
+SELECT ?paragraph ?content WHERE {
+    VALUES ?term { %s }
+    ?paragraph a bgb-onto:Paragraph ;
+               bgb-onto:textContent ?content .
+    FILTER(CONTAINS(LCASE(?content), ?term))
+} LIMIT %d
+"""
+
+# Uses Blazegraph's full-text index (requires textIndex=true on the namespace)
+FULLTEXT_PARAGRAPH_QUERY = """
+PREFIX bgb-onto: <http://example.org/bgb/ontology/>
+PREFIX bds: <http://www.bigdata.com/rdf/search#>
+
+SELECT ?paragraph ?content WHERE {
+    ?content bds:search %s ;
+             bds:matchAllTerms "true" .
+    ?paragraph a bgb-onto:Paragraph ;
+               bgb-onto:textContent ?content .
+} LIMIT %d
+"""
+
+# Post-load statistics and test queries in one request: the triple count
+# (a single-pattern COUNT that Blazegraph answers from its index range count),
+# sample concepts and a full-text paragraph search. Every row binds only the
+# variables of the branch it comes from.
+DIAGNOSTICS_QUERY = """
+PREFIX bgb-onto: <http://example.org/bgb/ontology/>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+PREFIX bds: <http://www.bigdata.com/rdf/search#>
+
+SELECT ?count ?concept ?label ?paragraph ?content WHERE {
+    {
+        SELECT (COUNT(*) AS ?count) WHERE { ?s ?p ?o . }
+    }
+    UNION
+    {
+        SELECT ?concept ?label WHERE {
+            ?concept a bgb-onto:LegalConcept ;
+                     rdfs:label ?label .
+        } LIMIT %d
+    }
+    UNION
+    {
+        SELECT ?paragraph ?content WHERE {
+            ?content bds:search %s ;
+                     bds:matchAllTerms "true" .
+            ?paragraph a bgb-onto:Paragraph ;
+                       bgb-onto:textContent ?content .
+        } LIMIT %d
+    }
+}
+"""
+
+_SPARQL_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    '"': '\\"',
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+})
+
+
+def _sparql_literal(value: str) -> str:
+    """Render a Python string as an escaped SPARQL string literal."""
+    return '"' + value.translate(_SPARQL_ESCAPES) + '"'
+
 
 class BlazegraphLoader:
     """
@@ -25,6 +120,21 @@ class BlazegraphLoader:
         self.blazegraph_url = blazegraph_url
         self.sparql_endpoint = f"{blazegraph_url}/sparql"
         self.update_endpoint = f"{blazegraph_url}/sparql"
+        self._triple_count = None
+
+        # Reuse one keep-alive connection for all requests to Blazegraph.
+        # Only SPARQL queries and uploads retry on transport errors; the
+        # connection check and readiness polls use the session's default
+        # adapter without retries, so an unreachable host fails fast
+        self.session = requests.Session()
+        self.session.mount(
+            self.sparql_endpoint,
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=4,
+                max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+            ),
+        )
 
         # Check Blazegraph connection
         self._check_blazegraph_connection()
@@ -32,12 +142,12 @@ class BlazegraphLoader:
     def _check_blazegraph_connection(self):
         """Check if Blazegraph is available."""
         try:
-            response = requests.get(f"{self.blazegraph_url}/status", timeout=10)
+            response = self.session.get(f"{self.blazegraph_url}/status", timeout=CHECK_TIMEOUT)
             if response.status_code == 200:
                 logger.info("Connected to Blazegraph at %s", self.blazegraph_url)
             else:
                 # Try the main page if status endpoint doesn't exist
-                response = requests.get(self.blazegraph_url, timeout=10)
+                response = self.session.get(self.blazegraph_url, timeout=CHECK_TIMEOUT)
                 response.raise_for_status()
                 logger.info("Connected to Blazegraph at %s", self.blazegraph_url)
         except requests.RequestException as e:
@@ -49,20 +159,14 @@ class BlazegraphLoader:
             )
             sys.exit(1)
 
+    def close(self):
+        """Close the HTTP session."""
+        self.session.close()
+
     def wait_for_blazegraph(self, timeout: int = 60):
         """Wait for Blazegraph to be ready."""
-        logger.info("Waiting for Blazegraph to be ready...")
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            try:
-                response = requests.get(self.blazegraph_url, timeout=5)
-                if response.status_code == 200:
-                    logger.info("Blazegraph is ready!")
-                    return True
-            except requests.RequestException:
-                pass
-            time.sleep(2)
+        if wait_for_blazegraph(self.blazegraph_url, timeout, session=self.session):
+            return True
 
         logger.error("Blazegraph failed to start within %d seconds", timeout)
         return False
@@ -71,20 +175,19 @@ class BlazegraphLoader:
         """Clear all data from the Blazegraph database."""
         logger.info("Clearing Blazegraph database...")
 
-        clear_query = """
-        DELETE WHERE {
-            ?s ?p ?o .
-        }
-        """
+        # DROP ALL removes all graphs at the storage layer instead of
+        # binding and deleting every triple individually
+        clear_query = "DROP ALL"
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.update_endpoint,
                 data={"update": clear_query},
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=30,
+                timeout=300,
             )
             response.raise_for_status()
+            self._triple_count = None
             logger.info("Blazegraph database cleared successfully")
         except requests.RequestException as e:
             logger.error("Error clearing Blazegraph database: %s", e)
@@ -101,17 +204,17 @@ class BlazegraphLoader:
         logger.info("Loading TTL file: %s", ttl_file_path)
 
         try:
+            # Load data via POST to SPARQL endpoint, streaming the file body
+            # from disk instead of reading it into memory first
             with open(ttl_path, "rb") as f:
-                ttl_content = f.read()
-
-            # Load data via POST to SPARQL endpoint
-            response = requests.post(
-                self.sparql_endpoint,
-                data=ttl_content,
-                headers={"Content-Type": "text/turtle", "Accept": "application/xml"},
-                timeout=120,  # TTL files can be large
-            )
+                response = self.session.post(
+                    self.sparql_endpoint,
+                    data=f,
+                    headers={"Content-Type": "text/turtle", "Accept": "application/xml"},
+                    timeout=600,  # TTL files can be large
+                )
             response.raise_for_status()
+            self._triple_count = None
 
             logger.info("Successfully loaded TTL file into Blazegraph")
 
@@ -121,8 +224,56 @@ class BlazegraphLoader:
                 logger.error("Response content: %s", e.response.text)
             raise
 
+    def load_ttl_from_server(self, server_path: str) -> bool:
+        """
+        Let Blazegraph load a TTL file from its own filesystem via SPARQL LOAD.
+
+        The server reads the file directly, so nothing is uploaded over HTTP.
+        Returns False if the server could not load the file.
+        """
+        if not server_path.startswith("/"):
+            logger.warning("Server path must be absolute: %s", server_path)
+            return False
+
+        logger.info("Loading TTL file on the server: %s", server_path)
+        load_stmt = f"LOAD <{PurePosixPath(server_path).as_uri()}>"
+
+        try:
+            response = self.session.post(
+                self.update_endpoint,
+                data={"update": load_stmt},
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=600,
+            )
+            response.raise_for_status()
+            self._triple_count = None
+            logger.info("Successfully loaded TTL file into Blazegraph")
+            return True
+        except requests.RequestException as e:
+            logger.warning("Server-side LOAD failed: %s", e)
+            return False
+
     def get_triple_count(self):
         """Get the total number of triples in the database."""
+        if self._triple_count is not None:
+            return self._triple_count
+
+        # Blazegraph answers ESTCARD from index metadata without scanning
+        try:
+            response = self.session.get(
+                self.sparql_endpoint,
+                params={"ESTCARD": ""},
+                timeout=10,
+            )
+            response.raise_for_status()
+            match = ESTCARD_RE.search(response.text)
+            if match:
+                self._triple_count = int(match.group(1))
+                logger.info("Database contains %d triples", self._triple_count)
+                return self._triple_count
+        except requests.RequestException as e:
+            logger.warning("ESTCARD request failed, falling back to COUNT query: %s", e)
+
         count_query = """
         SELECT (COUNT(*) AS ?count) WHERE {
             ?s ?p ?o .
@@ -130,7 +281,7 @@ class BlazegraphLoader:
         """
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.sparql_endpoint,
                 data={"query": count_query},
                 headers={"Accept": "application/sparql-results+json"},
@@ -141,6 +292,7 @@ class BlazegraphLoader:
             result = response.json()
             count = int(result["results"]["bindings"][0]["count"]["value"])
             logger.info("Database contains %d triples", count)
+            self._triple_count = count
             return count
 
         except requests.RequestException as e:
@@ -151,19 +303,10 @@ class BlazegraphLoader:
         """Test SPARQL querying with a sample query."""
         logger.info("Testing SPARQL query...")
 
-        test_query = f"""
-        PREFIX bgb-data: <http://example.org/bgb/data/>
-        PREFIX bgb-onto: <http://example.org/bgb/ontology/>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        
-        SELECT ?concept ?label WHERE {{
-            ?concept a bgb-onto:LegalConcept ;
-                     rdfs:label ?label .
-        }} LIMIT {limit}
-        """
+        test_query = CONCEPT_QUERY % int(limit)
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.sparql_endpoint,
                 data={"query": test_query},
                 headers={"Accept": "application/sparql-results+json"},
@@ -172,75 +315,166 @@ class BlazegraphLoader:
             response.raise_for_status()
 
             result = response.json()
-            bindings = result.get("results", {}).get("bindings", [])
-
-            logger.info("Found %d legal concepts:", len(bindings))
-            for i, binding in enumerate(bindings, 1):
-                concept = binding["concept"]["value"]
-                label = binding["label"]["value"]
-                logger.info("%d. %s - %s", i, label, concept)
+            self._log_concepts(result.get("results", {}).get("bindings", []))
 
         except requests.RequestException as e:
             logger.error("Error testing SPARQL query: %s", e)
 
+    @staticmethod
+    def _log_concepts(bindings):
+        """Log the rows of a concept test query."""
+        logger.info("Found %d legal concepts:", len(bindings))
+        for i, binding in enumerate(bindings, 1):
+            concept = binding["concept"]["value"]
+            label = binding["label"]["value"]
+            logger.info("%d. %s - %s", i, label, concept)
+
+    def _search_paragraphs(self, search_term: str, limit: int):
+        """Find paragraphs containing a term, preferring the full-text index."""
+        fulltext_query = FULLTEXT_PARAGRAPH_QUERY % (_sparql_literal(search_term), int(limit))
+        try:
+            response = self.session.post(
+                self.sparql_endpoint,
+                data={"query": fulltext_query},
+                headers={"Accept": "application/sparql-results+json"},
+                timeout=30,
+            )
+            response.raise_for_status()
+            bindings = response.json().get("results", {}).get("bindings", [])
+            if bindings:
+                return bindings
+        except requests.RequestException as e:
+            logger.debug("Full-text search unavailable, falling back to CONTAINS: %s", e)
+
+        return self._scan_paragraphs(search_term, limit)
+
+    def _scan_paragraphs(self, search_term: str, limit: int):
+        """Find paragraphs containing a term by scanning, for namespaces without a text index."""
+        # The term is lowercased here once instead of per row in the FILTER
+        paragraph_query = PARAGRAPH_QUERY % (
+            _sparql_literal(search_term.lower()),
+            int(limit),
+        )
+        response = self.session.post(
+            self.sparql_endpoint,
+            data={"query": paragraph_query},
+            headers={"Accept": "application/sparql-results+json"},
+            timeout=30,
+        )
+        response.raise_for_status()
+        return response.json().get("results", {}).get("bindings", [])
+
     def test_paragraph_query(self, search_term: str = "Ehegatte", limit: int = 3):
         """Test querying for paragraphs containing a specific term."""
         logger.info("Testing paragraph search for: %s", search_term)
 
-        paragraph_query = f"""
-        PREFIX bgb-data: <http://example.org/bgb/data/>
-        PREFIX bgb-onto: <http://example.org/bgb/ontology/>
-        
-        SELECT ?paragraph ?content WHERE {{
-            ?paragraph a bgb-onto:Paragraph ;
-                       bgb-onto:textContent ?content .
-            FILTER(CONTAINS(LCASE(?content), LCASE("{search_term}")))
-        }} LIMIT {limit}
+        try:
+            bindings = self._search_paragraphs(search_term, limit)
+            self._log_paragraphs(search_term, bindings)
+
+        except requests.RequestException as e:
+            logger.error("Error testing paragraph query: %s", e)
+
+    @staticmethod
+    def _log_paragraphs(search_term: str, bindings):
+        """Log the rows of a paragraph test query."""
+        logger.info(
+            "Found %d paragraphs containing '%s':", len(bindings), search_term
+        )
+        for i, binding in enumerate(bindings, 1):
+            paragraph = binding["paragraph"]["value"]
+            content = binding["content"]["value"]
+            # Truncate long content
+            if len(content) > 100:
+                content = content[:97] + "..."
+            logger.info("%d. %s", i, paragraph)
+            logger.info("   Content: %s", content)
+            logger.info("")
+
+    def run_postload_diagnostics(
+        self, search_term: str = "Ehegatte", concept_limit: int = 5, paragraph_limit: int = 3
+    ):
         """
+        Get the triple count and run the test queries in one SPARQL request.
 
+        Falls back to the individual methods if the combined query fails (e.g.
+        the namespace has no text index), and to a CONTAINS scan if the
+        full-text search finds no paragraphs.
+        """
+        diagnostics_query = DIAGNOSTICS_QUERY % (
+            int(concept_limit),
+            _sparql_literal(search_term),
+            int(paragraph_limit),
+        )
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.sparql_endpoint,
-                data={"query": paragraph_query},
+                data={"query": diagnostics_query},
                 headers={"Accept": "application/sparql-results+json"},
                 timeout=30,
             )
             response.raise_for_status()
+            bindings = response.json().get("results", {}).get("bindings", [])
+        except requests.RequestException as e:
+            logger.warning("Combined diagnostics query failed, running queries separately: %s", e)
+            triple_count = self.get_triple_count()
+            self.test_sparql_query(concept_limit)
+            self.test_paragraph_query(search_term, paragraph_limit)
+            return triple_count
+
+        # Split the UNION rows by the variables each branch binds
+        triple_count = 0
+        concepts = []
+        paragraphs = []
+        for binding in bindings:
+            if "count" in binding:
+                triple_count = int(binding["count"]["value"])
+            elif "concept" in binding:
+                concepts.append(binding)
+            elif "paragraph" in binding:
+                paragraphs.append(binding)
+
+        self._triple_count = triple_count
+        logger.info("Database contains %d triples", triple_count)
 
-            result = response.json()
-            bindings = result.get("results", {}).get("bindings", [])
+        logger.info("Testing SPARQL query...")
+        self._log_concepts(concepts)
 
-            logger.info(
-                "Found %d paragraphs containing '%s':", len(bindings), search_term
-            )
-            for i, binding in enumerate(bindings, 1):
-                paragraph = binding["paragraph"]["value"]
-                content = binding["content"]["value"]
-                # Truncate long content
-                if len(content) > 100:
-                    content = content[:97] + "..."
-                logger.info("%d. %s", i, paragraph)
-                logger.info("   Content: %s", content)
-                logger.info("")
+        logger.info("Testing paragraph search for: %s", search_term)
+        if not paragraphs:
+            try:
+                paragraphs = self._scan_paragraphs(search_term, paragraph_limit)
+            except requests.RequestException as e:
+                logger.error("Error testing paragraph query: %s", e)
+                return triple_count
+        self._log_paragraphs(search_term, paragraphs)
 
-        except requests.RequestException as e:
-            logger.error("Error testing paragraph query: %s", e)
+        return triple_count
 
 
-def wait_for_blazegraph(blazegraph_url: str, timeout: int = 60):
+def wait_for_blazegraph(
+    blazegraph_url: str, timeout: int = 60, session: requests.Session = None
+):
     """Wait for Blazegraph to be ready."""
     logger.info("Waiting for Blazegraph to be ready...")
+    http = session or requests
     start_time = time.time()
+    delay = 0.1
 
     while time.time() - start_time < timeout:
         try:
-            response = requests.get(blazegraph_url, timeout=5)
+            # HEAD avoids downloading the status page on every poll; redirects
+            # are followed and only a 200 counts (Jetty answers 404 until the
+            # webapp is deployed)
+            response = http.head(blazegraph_url, timeout=POLL_TIMEOUT, allow_redirects=True)
             if response.status_code == 200:
                 logger.info("Blazegraph is ready!")
                 return True
         except requests.RequestException:
             pass
-        time.sleep(2)
+        # Poll quickly at first, back off exponentially up to 2s
+        time.sleep(delay)
+        delay = min(delay * 2, 2.0)
 
     return False
 
@@ -252,6 +486,11 @@ def main():
         default="kg_curation/output/bgb.ttl",
         help="Path to the TTL file (default: kg_curation/output/bgb.ttl)",
     )
+    parser.add_argument(
+        "--server-file",
+        help="Path of the TTL file as seen by Blazegraph (e.g. /data/bgb.ttl with "
+        "docker-compose); loads it server-side and falls back to uploading --ttl-file",
+    )
     parser.add_argument(
         "--blazegraph-url",
         default="http://localhost:9999/bigdata",
@@ -288,21 +527,16 @@ def main():
 
     # Load TTL file
     start_time = time.time()
-    loader.load_ttl_file(args.ttl_file)
+    if not (args.server_file and loader.load_ttl_from_server(args.server_file)):
+        loader.load_ttl_file(args.ttl_file)
     end_time = time.time()
 
     logger.info("Loading completed in %.2f seconds", end_time - start_time)
 
-    # Get and display statistics
-    triple_count = loader.get_triple_count()
-
-    # Test queries
-    loader.test_sparql_query()
+    # Get statistics and run test queries in one request
+    loader.run_postload_diagnostics(args.test_query or "Ehegatte")
 
-    if args.test_query:
-        loader.test_paragraph_query(args.test_query)
-    else:
-        loader.test_paragraph_query("Ehegatte")
+    loader.close()
 
     logger.info("Blazegraph is ready for SPARQL queries!")
     logger.info("Web interface: %s", args.blazegraph_url)
@@ -21,11 +21,21 @@ Improvements in this version:
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import re
-import xml.etree.ElementTree as ET
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+import orjson
+
+# lxml's parser is considerably faster than the stdlib one; both expose the
+# same ElementTree API used here
+try:
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
 
 # Imports directly from your provided model.py
 from model import LegalCode, Norm, Paragraph, LegalConcept, ParagraphReference
@@ -37,24 +47,30 @@ from model import LegalCode, Norm, Paragraph, LegalConcept, ParagraphReference
 NORM_IDENT_RE = re.compile(r"§\s*([0-9]+[a-zA-Z]?)")
 # Regex to split paragraphs by (1), (2), etc.
 PARA_SPLIT_RE = re.compile(r"\((\d+)\)")
-# Regex for references to other norms
-REFERENCE_RE = re.compile(r"§\s*([0-9]+[a-zA-Z]?)")
-# Regex for concept definitions (e.g., "Verbraucher ist..." or "Eingetragener Verein ist...")
-CONCEPT_DEF_RE = re.compile(
+# Single-pass regex for references to other norms ("§ 12a") and concept
+# definitions (e.g., "Verbraucher ist..." or "Eingetragener Verein ist...").
+# The two alternatives cannot overlap, so one scan finds the same matches as
+# two separate ones.
+PARAGRAPH_TOKEN_RE = re.compile(
+    r"(?P<ref>§\s*(?P<ref_num>[0-9]+[a-zA-Z]?))"
     # Captures multi-word, capitalized concepts
-    r"\b((?:[A-ZÄÖÜ][a-zäöüA-ZÄÖÜ]+)(?:\s+[A-ZÄÖÜ][a-zäöüA-ZÄÖÜ]+)*)\b\s+ist\b"
+    r"|\b(?P<concept>(?:[A-ZÄÖÜ][a-zäöüA-ZÄÖÜ]+)(?:\s+[A-ZÄÖÜ][a-zäöüA-ZÄÖÜ]+)*)\b\s+ist\b"
 )
+# Fallback paragraph separator
+DOUBLE_NEWLINE_RE = re.compile(r"\n\n+")
+# Marker for repealed norms, matched without lowercasing the text first
+REPEALED_RE = re.compile(r"\(weggefallen\)", re.IGNORECASE)
 
 
 # --- New XML Helper Functions ---
 
-def get_norm_body_text(content_elem: ET.Element | None) -> str:
+def get_norm_segments(content_elem: ET.Element | None) -> List[str]:
     """
-    Extracts and joins text from <P> tags within a <Content> element,
-    preserving paragraph breaks as double newlines.
+    Extracts the text of each <P> tag within a <Content> element as a
+    separate segment.
     """
     if content_elem is None:
-        return ""
+        return []
 
     paragraphs = []
     # Find all <P> tags, which typically segment the legal text
@@ -67,10 +83,85 @@ def get_norm_body_text(content_elem: ET.Element | None) -> str:
     if not paragraphs:
         # Fallback: If no <P> tags, grab all text from the <Content> block
         text = "".join(content_elem.itertext()).strip()
-        return text
+        return [text] if text else []
+
+    return paragraphs
+
+
+def get_norm_body_text(content_elem: ET.Element | None) -> str:
+    """
+    Extracts and joins text from <P> tags within a <Content> element,
+    preserving paragraph breaks as double newlines.
+    """
+    return "\n\n".join(get_norm_segments(content_elem))
 
-    # Join paragraphs with double newlines for the split heuristic
-    return "\n\n".join(paragraphs)
+
+def parse_norm_header(norm_elem: ET.Element) -> Tuple[Norm, List[str]] | None:
+    """
+    Parses the metadata of a single <norm> element into a Norm without
+    paragraphs, plus its text segments. Returns None if the norm cannot be
+    identified.
+    """
+    meta = norm_elem.find('metadaten')
+    text_data = norm_elem.find('textdaten')
+
+    if meta is None or text_data is None:
+        return None  # Skip if essential blocks are missing
+
+    enbez_elem = meta.find('enbez')  # e.g., <enbez>§ 1</enbez>
+    titel_elem = meta.find('titel')  # e.g., <titel>Beginn der Rechtsfähigkeit</titel>
+
+    norm_identifier_text = (
+        enbez_elem.text.strip() if enbez_elem is not None and enbez_elem.text else ""
+    )
+    title_text = (
+        titel_elem.text.strip() if titel_elem is not None and titel_elem.text else ""
+    )
+
+    ident_match = NORM_IDENT_RE.search(norm_identifier_text)
+    if not ident_match:
+        ident_match = NORM_IDENT_RE.search(title_text)
+        if not ident_match:
+            return None  # Cannot reliably identify this norm
+
+    ident = ident_match.group(1)
+    norm_identifier = f"§ {ident}"
+    full_title = f"{norm_identifier} {title_text}".strip()
+
+    content_elem = text_data.find('.//Content')
+    segments = get_norm_segments(content_elem)
+
+    is_repealed = bool(
+        REPEALED_RE.search(title_text)
+        or any(REPEALED_RE.search(segment) for segment in segments)
+    )
+
+    # Fields are built from our own parsing, so skip pydantic validation
+    current_norm = Norm.model_construct(
+        id=f"bgb-data:norm_{ident}",
+        norm_identifier=norm_identifier,
+        title=full_title,
+        is_repealed=is_repealed,
+        paragraphs=[],  # Populated by build_paragraphs
+    )
+    return current_norm, segments
+
+
+def parse_norm(
+    norm_elem: ET.Element, concept_index: Dict[str, LegalConcept] | None = None
+) -> Norm | None:
+    """
+    Parses a single <norm> element into a Norm, or returns None if it
+    cannot be identified. Defined concepts are also collected into
+    concept_index if given.
+    """
+    header = parse_norm_header(norm_elem)
+    if header is None:
+        return None
+
+    current_norm, segments = header
+    current_norm.paragraphs = build_paragraphs(segments, current_norm, concept_index)
+    return current_norm
 
 
 def parse_norms_from_xml(root: ET.Element) -> List[Norm]:
@@ -78,71 +169,110 @@ def parse_norms_from_xml(root: ET.Element) -> List[Norm]:
     Parses Norm objects by iterating over the hierarchical <norm> tags
     in the XML tree.
     """
-    norms: List[Norm] = []
-    
-    # Iterate over every <norm> tag in the document
-    for norm_elem in root.findall('.//norm'):
-        meta = norm_elem.find('metadaten')
-        text_data = norm_elem.find('textdaten')
+    norms = (parse_norm(norm_elem) for norm_elem in root.findall('.//norm'))
+    return [norm for norm in norms if norm is not None]
 
-        if meta is None or text_data is None:
-            continue  # Skip if essential blocks are missing
 
-        enbez_elem = meta.find('enbez')  # e.g., <enbez>§ 1</enbez>
-        titel_elem = meta.find('titel')  # e.g., <titel>Beginn der Rechtsfähigkeit</titel>
-
-        norm_identifier_text = (
-            enbez_elem.text.strip() if enbez_elem is not None and enbez_elem.text else ""
-        )
-        title_text = (
-            titel_elem.text.strip() if titel_elem is not None and titel_elem.text else ""
-        )
+def iter_norm_elements(xml_path: str) -> Iterator[ET.Element]:
+    """
+    Stream-parses the XML file and yields each complete <norm> element.
 
-        ident_match = NORM_IDENT_RE.search(norm_identifier_text)
-        if not ident_match:
-            ident_match = NORM_IDENT_RE.search(title_text)
-            if not ident_match:
-                continue  # Cannot reliably identify this norm
-
-        ident = ident_match.group(1)
-        norm_identifier = f"§ {ident}"
-        full_title = f"{norm_identifier} {title_text}".strip()
-
-        content_elem = text_data.find('.//Content')
-        norm_body = get_norm_body_text(content_elem)
-
-        is_repealed = '(weggefallen)' in title_text.lower() or \
-                      '(weggefallen)' in norm_body.lower()
-
-        current_norm = Norm(
-            id=f"bgb-data:norm_{ident}",
-            norm_identifier=norm_identifier,
-            title=full_title,
-            is_repealed=is_repealed,
-            paragraphs=[],  # Will be populated below
+    Each element is discarded once the consumer moves on, so memory stays
+    bounded by a single norm instead of the whole document.
+    """
+    if LXML_AVAILABLE:
+        # Keep comments/PIs out of the tree so itertext() sees only text
+        events = ET.iterparse(
+            xml_path, events=("start", "end"), remove_comments=True, remove_pis=True
         )
+    else:
+        events = ET.iterparse(xml_path, events=("start", "end"))
+
+    root = None
+    for event, elem in events:
+        if root is None:
+            root = elem
+        if event == "end" and elem.tag == "norm":
+            yield elem
+            # Drop the finished norm (and any other completed siblings)
+            root.clear()
+
+
+def iter_norms_from_file(
+    xml_path: str, concept_index: Dict[str, LegalConcept] | None = None
+) -> Iterator[Norm]:
+    """Stream-parses the XML file and yields one Norm per <norm> tag."""
+    for norm_elem in iter_norm_elements(xml_path):
+        norm = parse_norm(norm_elem, concept_index)
+        if norm is not None:
+            yield norm
+
+
+def _build_paragraphs_worker(header: Tuple[Norm, List[str]]) -> List[Paragraph]:
+    """Process pool entry point: builds the paragraphs of one norm."""
+    norm, segments = header
+    return build_paragraphs(segments, norm)
+
+
+def parse_norms_parallel(
+    xml_path: str,
+    concept_index: Dict[str, LegalConcept] | None = None,
+    workers: int | None = None,
+) -> List[Norm]:
+    """
+    Parses all norms, building paragraphs in a process pool.
 
-        current_norm.paragraphs = build_paragraphs(norm_body, current_norm)
-        norms.append(current_norm)
+    Reading the XML and the norm metadata is cheap and stays serial; the
+    regex-heavy paragraph, reference and concept extraction runs per norm in
+    worker processes. Results keep document order.
+    """
+    headers = [
+        header
+        for header in map(parse_norm_header, iter_norm_elements(xml_path))
+        if header is not None
+    ]
 
+    norms: List[Norm] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        paragraph_lists = executor.map(_build_paragraphs_worker, headers, chunksize=32)
+        for (norm, _), paragraphs in zip(headers, paragraph_lists):
+            norm.paragraphs = paragraphs
+            if concept_index is not None:
+                # Same first-definition-wins order as the serial path
+                for paragraph in paragraphs:
+                    for concept in paragraph.defines_concepts:
+                        concept_index.setdefault(concept.id, concept)
+            norms.append(norm)
     return norms
 
 
 # --- Kept/Modified Functions ---
 
-def build_paragraphs(text: str, norm: Norm) -> List[Paragraph]:
-    """Splits norm body into paragraphs using (1) markers or double-newline fallback."""
+def build_paragraphs(
+    segments: List[str],
+    norm: Norm,
+    concept_index: Dict[str, LegalConcept] | None = None,
+) -> List[Paragraph]:
+    """Splits norm body segments into paragraphs using (1) markers or double-newline fallback."""
     paragraphs: List[Paragraph] = []
-    parts = PARA_SPLIT_RE.split(text)
 
-    if len(parts) > 1:
+    # Repealed norms usually have no body or only the "(weggefallen)" marker;
+    # handle them without the marker scans and splits below
+    if not segments:
+        return paragraphs
+    if norm.is_repealed and len(segments) == 1 and REPEALED_RE.fullmatch(segments[0]):
+        return [build_paragraph(norm, "1", segments[0], concept_index)]
+
+    if any(PARA_SPLIT_RE.search(segment) for segment in segments):
+        # Markers may span segments, so split the joined body
+        parts = PARA_SPLIT_RE.split("\n\n".join(segments))
         # PARA_SPLIT_RE produces: ['', '1', ' rest', '2', ' rest', ...]
         it = iter(parts)
         leading_text = next(it).strip()  # Text before the first (1)
 
         if leading_text:
             # Handle text before the first (1) as paragraph "0"
-            paragraphs.append(build_paragraph(norm, "0", leading_text))
+            paragraphs.append(build_paragraph(norm, "0", leading_text, concept_index))
 
         seen_numbers = set()
         for number, body in zip(it, it):
@@ -157,43 +287,58 @@ def build_paragraphs(text: str, norm: Norm) -> List[Paragraph]:
                 counter += 1
             seen_numbers.add(number)
 
-            paragraphs.append(build_paragraph(norm, orig_number, body_clean))
+            paragraphs.append(build_paragraph(norm, orig_number, body_clean, concept_index))
     else:
-        # No (1) markers, use double-newline split
-        chunks = [c.strip() for c in re.split(r"\n\n+", text) if c.strip()]
-        if not chunks and text:  # Handle single, non-empty block
-            chunks = [text]
+        # No (1) markers: the segments already are the double-newline
+        # blocks, so split them individually instead of joining first
+        chunks = [
+            c.strip()
+            for segment in segments
+            for c in DOUBLE_NEWLINE_RE.split(segment)
+            if c.strip()
+        ]
 
         for idx, chunk in enumerate(chunks, start=1):
-            paragraphs.append(build_paragraph(norm, str(idx), chunk))
+            paragraphs.append(build_paragraph(norm, str(idx), chunk, concept_index))
     return paragraphs
 
 
-def build_paragraph(norm: Norm, number: str, body: str) -> Paragraph:
-    """Builds a single Paragraph object, finding references and concepts."""
+def build_paragraph(
+    norm: Norm,
+    number: str,
+    body: str,
+    concept_index: Dict[str, LegalConcept] | None = None,
+) -> Paragraph:
+    """
+    Builds a single Paragraph object, finding references and concepts.
+    Concepts are registered in concept_index (first definition wins) if given.
+    """
     para_id = f"bgb-data:{norm.id.split(':')[1]}_para_{number}"
 
-    # Find references
+    # Find references and concept definitions in one pass
     references: List[ParagraphReference] = []
-    for m in REFERENCE_RE.finditer(body):
-        ref_num = m.group(1)
-        target_id = f"bgb-data:norm_{ref_num}"
-        references.append(
-            ParagraphReference(target_norm_id=target_id, text_snippet=m.group(0))
-        )
-
-    # Find concept definitions
     concepts: List[LegalConcept] = []
-    for m in CONCEPT_DEF_RE.finditer(body):
-        label = m.group(1).strip()
-        # Create a stable ID from the label
-        concept_id_label = label.replace(' ', '_')
-        concept_id = f"bgb-data:concept_{concept_id_label}"
-        concepts.append(
-            LegalConcept(id=concept_id, label=label, defined_in=para_id)
-        )
-
-    return Paragraph(
+    # Cheap substring checks first: most bodies contain neither a "§" nor
+    # "ist", so the regex engine does not need to run for them at all
+    matches = PARAGRAPH_TOKEN_RE.finditer(body) if "§" in body or "ist" in body else ()
+    for m in matches:
+        if m.group("ref"):
+            target_id = f"bgb-data:norm_{m.group('ref_num')}"
+            references.append(
+                ParagraphReference.model_construct(target_norm_id=target_id, text_snippet=m.group("ref"))
+            )
+        else:
+            label = m.group("concept").strip()
+            # Create a stable ID from the label
+            concept_id_label = label.replace(' ', '_')
+            concept_id = f"bgb-data:concept_{concept_id_label}"
+            concept = LegalConcept.model_construct(id=concept_id, label=label, defined_in=para_id)
+            concepts.append(concept)
+            if concept_index is not None:
+                concept_index.setdefault(concept_id, concept)
+
+    # Trusted internal construction: skip validation (LegalCode still validates)
+    return Paragraph.model_construct(
         id=para_id,
         paragraph_identifier=number,
         text_content=body,
@@ -202,20 +347,26 @@ def build_paragraph(norm: Norm, number: str, body: str) -> Paragraph:
     )
 
 
-def transform(xml_path: str) -> LegalCode:
-    """Main transformation logic."""
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-
-    # Use the new, robust XML-parsing function
-    norms = parse_norms_from_xml(root)
+def transform(xml_path: str, workers: int | None = 1) -> LegalCode:
+    """
+    Main transformation logic. With workers other than 1, paragraphs are
+    built in a process pool (None uses all CPUs).
+    """
+    # Stream the document instead of building the full tree in memory;
+    # concepts are collected while the paragraphs are built
+    concept_index: Dict[str, LegalConcept] = {}
+    if workers == 1:
+        norms = list(iter_norms_from_file(xml_path, concept_index))
+    else:
+        norms = parse_norms_parallel(xml_path, concept_index, workers)
     
     # Create the LegalCode object based on model.py definition
-    # (id, title, norms)
+    # (id, title, norms, concepts)
     code = LegalCode(
         id="bgb-data:BGB",
         title="Bürgerliches Gesetzbuch",
         norms=norms,
+        concepts=list(concept_index.values()),
     )
     return code
 
@@ -225,10 +376,16 @@ def main(argv: List[str] | None = None) -> int:
     parser.add_argument("--input", required=True, help="Path to raw BGB XML file")
     parser.add_argument("--output", required=True, help="Path to output JSON file")
     parser.add_argument("--jsonld", action="store_true", help="Emit JSON-LD with @context")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for paragraph extraction (default 1 = serial, 0 = all CPUs)",
+    )
     args = parser.parse_args(argv)
 
     try:
-        code = transform(args.input)
+        code = transform(args.input, workers=args.workers or None)
     except ET.ParseError as e:
         print(f"Error: Failed to parse XML file at {args.input}.")
         print(f"Details: {e}")
@@ -237,37 +394,27 @@ def main(argv: List[str] | None = None) -> int:
         print(f"Error: Input file not found at {args.input}")
         return 1
 
-    # --- Concept Aggregation and Serialization ---
-    # We call build_concept_index() here, as intended by your model.
-    concept_index = code.build_concept_index()
-    concepts_list = list(concept_index.values())
-
+    # --- Serialization ---
+    # The global concept registry was filled during parsing, so model_dump()
+    # already includes it without re-walking norms and paragraphs
     data = code.to_json_ld() if args.jsonld else code.model_dump()
-
-    # **FIX**: If not using JSON-LD, model_dump() won't include concepts
-    # because `concepts` isn't a field on the LegalCode model.
-    # We manually add it to the output dict to match the ontology.
-    if not args.jsonld:
-        # We must dump the concept models to dicts as well
-        data['concepts'] = [c.model_dump() for c in concepts_list]
-    # -----------------------------------------------
     
     out_dir = os.path.dirname(args.output)
     if out_dir and not os.path.exists(out_dir):
         os.makedirs(out_dir, exist_ok=True)
 
     try:
-        with open(args.output, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # orjson writes UTF-8 bytes directly (like ensure_ascii=False)
+        with open(args.output, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     except IOError as e:
         print(f"Error: Could not write to output file at {args.output}.")
         print(f"Details: {e}")
         return 1
 
-    # This print statement will now work correctly
     print(
         f"Wrote {args.output} containing {len(code.norms)} norms and "
-        f"{len(concepts_list)} concepts."
+        f"{len(code.concepts)} concepts."
     )
     return 0
 
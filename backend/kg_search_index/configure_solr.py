@@ -3,37 +3,60 @@
 Configure Solr core for BGB indexing
 """
 
-import json
 import logging
 import requests
 import sys
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Length of the text_content_snippet previews shown by search clients
+SNIPPET_MAX_CHARS = 300
 
-def wait_for_solr(solr_base_url: str, timeout: int = 60):
+
+def create_session() -> requests.Session:
+    """Create a session that keeps one keep-alive connection to Solr."""
+    session = requests.Session()
+    session.mount(
+        "http://",
+        HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        ),
+    )
+    return session
+
+
+def wait_for_solr(solr_base_url: str, timeout: int = 60, session: requests.Session = None):
     """Wait for Solr to be ready."""
     logger.info("Waiting for Solr to be ready...")
+    http = session or requests
     start_time = time.time()
+    delay = 0.1
 
     while time.time() - start_time < timeout:
         try:
-            response = requests.get(f"{solr_base_url}/admin/cores", timeout=5)
+            response = http.get(f"{solr_base_url}/admin/cores", timeout=5)
             if response.status_code == 200:
                 logger.info("Solr is ready!")
                 return True
         except requests.RequestException:
             pass
-        time.sleep(1)
+        # Poll quickly at first, back off exponentially up to 1s
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
 
     return False
 
 
-def configure_core_schema(solr_url: str):
+def configure_core_schema(solr_url: str, session: requests.Session = None):
     """Configure the Solr core schema."""
     schema_api = f"{solr_url}/schema"
+    http = session or requests
 
     # Add German text field type
     field_type = {
@@ -50,70 +73,86 @@ def configure_core_schema(solr_url: str):
         },
     }
 
-    try:
-        requests.post(
-            schema_api,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps({"add-field-type": field_type}),
-            timeout=10,
-        )
-        logger.info("Added German text field type")
-    except requests.RequestException:
-        pass  # Field type might already exist
-
     # Add required fields
     fields = [
         {"name": "label", "type": "text_de", "indexed": True, "stored": True},
         {"name": "title", "type": "text_de", "indexed": True, "stored": True},
         {"name": "text_content", "type": "text_de", "indexed": True, "stored": True},
         {"name": "search_text", "type": "text_de", "indexed": True, "stored": False, "multiValued": True},
+        # Stored-only prefix of text_content, so search clients can show a
+        # snippet without fetching the full norm text
+        {"name": "text_content_snippet", "type": "string", "indexed": False, "stored": True},
     ]
 
-    for field in fields:
-        try:
-            requests.post(
-                schema_api,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps({"add-field": field}),
-                timeout=10,
-            )
-            logger.info("Added field: %s", field["name"])
-        except requests.RequestException:
-            pass  # Field might already exist
-
     # Add copy fields to populate search_text
     copy_fields = [
         {"source": "label", "dest": "search_text"},
         {"source": "title", "dest": "search_text"},
         {"source": "text_content", "dest": "search_text"},
+        # One character more than the displayed snippet, so clients can tell
+        # that the text was cut
+        {"source": "text_content", "dest": "text_content_snippet", "maxChars": SNIPPET_MAX_CHARS + 1},
     ]
 
-    for copy_field in copy_fields:
-        try:
-            requests.post(
-                schema_api,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps({"add-copy-field": copy_field}),
-                timeout=10,
-            )
-            logger.info("Added copy field: %s -> %s", copy_field["source"], copy_field["dest"])
-        except requests.RequestException:
-            pass  # Copy field might already exist
+    # A bulk schema request is applied atomically, so one already existing
+    # entry would reject the whole batch: fetch the schema once and only send
+    # what is missing
+    try:
+        response = http.get(schema_api, timeout=10)
+        response.raise_for_status()
+        schema = response.json().get("schema", {})
+    except (requests.RequestException, ValueError) as e:
+        logger.error("Cannot read schema: %s", e)
+        return
+
+    existing_types = {t["name"] for t in schema.get("fieldTypes", [])}
+    existing_fields = {f["name"] for f in schema.get("fields", [])}
+    existing_copies = {(c["source"], c["dest"]) for c in schema.get("copyFields", [])}
+
+    commands = {}
+    if field_type["name"] not in existing_types:
+        commands["add-field-type"] = [field_type]
+    new_fields = [f for f in fields if f["name"] not in existing_fields]
+    if new_fields:
+        commands["add-field"] = new_fields
+    new_copies = [c for c in copy_fields if (c["source"], c["dest"]) not in existing_copies]
+    if new_copies:
+        commands["add-copy-field"] = new_copies
+
+    if not commands:
+        logger.info("Schema already configured")
+        return
+
+    # Send all schema changes in a single request
+    try:
+        response = http.post(schema_api, json=commands, timeout=30)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logger.error("Error updating schema: %s", e)
+        return
+
+    if "add-field-type" in commands:
+        logger.info("Added German text field type")
+    for field in new_fields:
+        logger.info("Added field: %s", field["name"])
+    for copy_field in new_copies:
+        logger.info("Added copy field: %s -> %s", copy_field["source"], copy_field["dest"])
 
 
 def main():
     solr_base_url = "http://localhost:8984/solr"
     core_name = "bgb_core"
     solr_url = f"{solr_base_url}/{core_name}"
+    session = create_session()
 
     # Wait for Solr
-    if not wait_for_solr(solr_base_url):
+    if not wait_for_solr(solr_base_url, session=session):
         logger.error("Solr failed to start")
         sys.exit(1)
 
     # Check if core exists
     try:
-        response = requests.get(f"{solr_url}/admin/ping", timeout=5)
+        response = session.get(f"{solr_url}/admin/ping", timeout=5)
         if response.status_code == 200:
             logger.info("Core %s is ready", core_name)
         else:
@@ -124,7 +163,8 @@ def main():
         sys.exit(1)
 
     # Configure schema
-    configure_core_schema(solr_url)
+    configure_core_schema(solr_url, session=session)
+    session.close()
 
     logger.info("Solr configuration complete!")
 
@@ -11,10 +11,54 @@ Usage:
 """
 
 import argparse
-import json
+import re
 import sys
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional
 import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson decodes large (highlighted) responses much faster than the stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
+# Repeated queries within the TTL are answered from memory
+SEARCH_CACHE_MAXSIZE = 128
+SEARCH_CACHE_TTL = 60  # seconds
+
+# Fields searched by edismax, with boosts for the short descriptive fields
+TEXT_FIELDS = "label^2 title^1.5 text_content norm_number"
+
+# Characters with a meaning in Solr query syntax (&& and || are escaped
+# character by character, as SolrJ's ClientUtils does)
+SOLR_SPECIAL_RE = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+RESULT_SEPARATOR = "=" * 80
+
+# Single-line fields shown per result by print_results, in display order
+FIELD_LABELS = (
+    ("label", "   Label: {}"),
+    ("title", "   Title: {}"),
+    ("norm_number", "   Norm: §{}"),
+    ("paragraph_number", "   Paragraph: {}"),
+)
+
+
+def _escape_query(query: str) -> str:
+    """Escape Solr query syntax so user input is searched literally."""
+    return SOLR_SPECIAL_RE.sub(r"\\\1", query)
+
+
+def _unwrap(doc: Dict, key: str, default=None):
+    """Return a Solr field value, taking the first entry of multi-valued fields."""
+    value = doc.get(key, default)
+    return value[0] if type(value) is list else value
 
 
 class BGBQueryInterface:
@@ -25,6 +69,19 @@ class BGBQueryInterface:
     def __init__(self, solr_url: str = "http://localhost:8984/solr/bgb_core"):
         self.solr_url = solr_url
         self.select_url = f"{solr_url}/select"
+        self._search_cache = TTLCache(maxsize=SEARCH_CACHE_MAXSIZE, ttl=SEARCH_CACHE_TTL)
+
+        # Keep-alive connection reused by all queries (requests already
+        # asks for gzip-compressed responses by default)
+        self._http = requests.Session()
+        self._http.mount(
+            "http://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=Retry(total=2, backoff_factor=0.2),
+            ),
+        )
 
         # Check Solr connection
         self._check_solr_connection()
@@ -32,7 +89,7 @@ class BGBQueryInterface:
     def _check_solr_connection(self):
         """Check if Solr is available."""
         try:
-            response = requests.get(f"{self.solr_url}/admin/ping", timeout=5)
+            response = self._http.get(f"{self.solr_url}/admin/ping", timeout=5)
             response.raise_for_status()
             print(f"✓ Connected to Solr at {self.solr_url}")
         except requests.RequestException as e:
@@ -43,7 +100,11 @@ class BGBQueryInterface:
             sys.exit(1)
 
     def search(
-        self, query: str, max_results: int = 10, document_type: str = None
+        self,
+        query: str,
+        max_results: int = 10,
+        document_type: str = None,
+        escape: bool = True,
     ) -> List[Dict]:
         """
         Search the BGB index with natural language query.
@@ -52,37 +113,51 @@ class BGBQueryInterface:
             query: Natural language search query
             max_results: Maximum number of results to return
             document_type: Filter by document type (legal_concept, norm, paragraph, legal_code)
+            escape: Escape Solr query syntax in query (False for raw Solr queries)
 
         Returns:
             List of search results
         """
-        # Build Solr query - search across multiple text fields
-        text_fields = ["label", "title", "text_content", "norm_number"]
-        field_queries = [f"{field}:({query})" for field in text_fields]
-        solr_query = " OR ".join(field_queries)
-
-        # Add type filter if specified
-        if document_type:
-            solr_query += f" AND type:{document_type}"
+        cache_key = (query, max_results, document_type, escape)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
+        # edismax spreads the query across the text fields itself
         params = {
-            "q": solr_query,
+            "q": _escape_query(query) if escape else query,
+            "defType": "edismax",
+            "qf": TEXT_FIELDS,
             "wt": "json",
+            "omitHeader": "true",
             "rows": max_results,
-            "fl": "id,uri,type,label,title,norm_number,paragraph_number,text_content,score",
+            # text_content is not fetched in full; its preview is the
+            # highlighter's snippet (or leading text when nothing matched)
+            "fl": "id,uri,type,label,title,norm_number,paragraph_number,score",
             "sort": "score desc",
             "hl": "true",
             "hl.fl": "label,title,text_content",
             "hl.simple.pre": "<b>",
             "hl.simple.post": "</b>",
             "hl.fragsize": 200,
+            "hl.snippets": 1,
+            "hl.defaultSummary": "true",
+            "hl.alternateField": "text_content",
+            "hl.maxAlternateFieldLength": 200,
         }
 
+        # Type filter as fq so Solr caches it independently of the query
+        if document_type:
+            params["fq"] = f"type:{document_type}"
+
         try:
-            response = requests.get(self.select_url, params=params, timeout=10)
+            response = self._http.get(self.select_url, params=params, timeout=10)
             response.raise_for_status()
 
-            result = response.json()
+            if ORJSON_AVAILABLE:
+                result = orjson.loads(response.content)
+            else:
+                result = json.loads(response.content)
             docs = result.get("response", {}).get("docs", [])
             highlighting = result.get("highlighting", {})
 
@@ -92,86 +167,68 @@ class BGBQueryInterface:
                 if doc_id in highlighting:
                     doc["highlighting"] = highlighting[doc_id]
 
+            self._search_cache[cache_key] = docs
             return docs
 
         except requests.RequestException as e:
             print(f"Error searching Solr: {e}")
             return []
 
+    def close(self):
+        """Close the HTTP session."""
+        self._http.close()
+
+    def clear_cache(self):
+        """Drop all cached search results."""
+        self._search_cache.clear()
+
     def print_results(self, results: List[Dict], query: str):
         """Print search results in a user-friendly format."""
         if not results:
             print(f"No results found for query: '{query}'")
             return
 
-        print(f"\nFound {len(results)} results for query: '{query}'\n")
-        print("=" * 80)
+        # Collect all lines and write them at once instead of one print
+        # (and one terminal write) per line
+        lines = ["", f"Found {len(results)} results for query: '{query}'", "", RESULT_SEPARATOR]
 
         for i, doc in enumerate(results, 1):
-            doc_type_raw = doc.get("type", ["unknown"])
-            doc_type = (
-                (doc_type_raw[0] if isinstance(doc_type_raw, list) else doc_type_raw)
-                .replace("_", " ")
-                .title()
-            )
-
-            uri_raw = doc.get("uri", ["no uri"])
-            uri = uri_raw[0] if isinstance(uri_raw, list) else uri_raw
-
+            doc_type = _unwrap(doc, "type", "unknown").replace("_", " ").title()
+            uri = _unwrap(doc, "uri", "no uri")
             score = doc.get("score", 0)
 
-            print(f"{i}. {doc_type} (Score: {score:.3f})")
-            print(f"   URI: {uri}")
+            lines.append(f"{i}. {doc_type} (Score: {score:.3f})")
+            lines.append(f"   URI: {uri}")
 
             # Show relevant text content
-            label_raw = doc.get("label")
-            if label_raw:
-                label = label_raw[0] if isinstance(label_raw, list) else label_raw
-                print(f"   Label: {label}")
-
-            title_raw = doc.get("title")
-            if title_raw:
-                title = title_raw[0] if isinstance(title_raw, list) else title_raw
-                print(f"   Title: {title}")
-
-            norm_number_raw = doc.get("norm_number")
-            if norm_number_raw:
-                norm_number = (
-                    norm_number_raw[0]
-                    if isinstance(norm_number_raw, list)
-                    else norm_number_raw
-                )
-                print(f"   Norm: §{norm_number}")
-
-            paragraph_number_raw = doc.get("paragraph_number")
-            if paragraph_number_raw:
-                paragraph_number = (
-                    paragraph_number_raw[0]
-                    if isinstance(paragraph_number_raw, list)
-                    else paragraph_number_raw
-                )
-                print(f"   Paragraph: {paragraph_number}")
-
-            # Show text content (truncated)
-            text_content_raw = doc.get("text_content")
-            if text_content_raw:
-                text_content = (
-                    text_content_raw[0]
-                    if isinstance(text_content_raw, list)
-                    else text_content_raw
-                )
-                if len(text_content) > 200:
-                    text_content = text_content[:197] + "..."
-                print(f"   Content: {text_content}")
-
-            # Show highlighting if available
-            if doc.get("highlighting"):
-                for field, highlights in doc["highlighting"].items():
-                    if highlights:
-                        print(f"   Highlight: {highlights[0]}")
-                        break
-
-            print()
+            for field, line in FIELD_LABELS:
+                value = _unwrap(doc, field)
+                if value:
+                    lines.append(line.format(value))
+
+            # Show text content snippet, truncating full text only if
+            # Solr returned no snippet
+            highlighting = doc.get("highlighting", {})
+            snippets = highlighting.get("text_content")
+            if snippets:
+                lines.append(f"   Content: {snippets[0]}")
+            else:
+                text_content = _unwrap(doc, "text_content")
+                if text_content:
+                    if len(text_content) > 200:
+                        text_content = text_content[:197] + "..."
+                    lines.append(f"   Content: {text_content}")
+
+            # Show label/title highlighting if available
+            for field, highlights in highlighting.items():
+                if field != "text_content" and highlights:
+                    lines.append(f"   Highlight: {highlights[0]}")
+                    break
+
+            lines.append("")
+
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
     def interactive_mode(self):
         """Run in interactive mode for multiple queries."""
@@ -232,9 +289,13 @@ class BGBQueryInterface:
                 return
 
             uri_part = parts[1]
-            results = self.search(f"uri:*{uri_part}*")
+            results = self.search(f"uri:*{_escape_query(uri_part)}*", escape=False)
             self.print_results(results, f"URI containing: {uri_part}")
 
+        elif cmd == "/clear":
+            self.clear_cache()
+            print("Search cache cleared")
+
         else:
             print(f"Unknown command: {cmd}")
             print("Type 'help' for available commands.")
@@ -250,6 +311,7 @@ Available commands:
   /type <type> <query>   - Search within specific document type
                           Types: legal_concept, norm, paragraph, legal_code
   /uri <partial_uri>     - Search for URIs containing the given text
+  /clear                 - Clear the search result cache
   
 Examples:
   Ehegatte               - Search for content about spouses
@@ -260,7 +322,9 @@ Examples:
         )
 
 
-def main():
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once per process (main() may be called repeatedly)."""
     parser = argparse.ArgumentParser(description="Query BGB Solr index")
     parser.add_argument(
         "query",
@@ -285,8 +349,11 @@ def main():
     parser.add_argument(
         "--interactive", "-i", action="store_true", help="Start in interactive mode"
     )
+    return parser
+
 
-    args = parser.parse_args()
+def main(argv: Optional[List[str]] = None):
+    args = _build_parser().parse_args(argv)
 
     # Create query interface
     interface = BGBQueryInterface(args.solr_url)
@@ -299,6 +366,8 @@ def main():
         results = interface.search(args.query, args.max_results, args.type)
         interface.print_results(results, args.query)
 
+    interface.close()
+
 
 if __name__ == "__main__":
     main()
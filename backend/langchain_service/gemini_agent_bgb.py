@@ -6,10 +6,20 @@ This implementation uses Google's Gemini API for function calling with proper
 message handling and response collection, providing an alternative to the local Qwen model.
 """
 
-import json
+import datetime
+import logging
 import os
-from typing import List, Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 import google.generativeai as genai
+import orjson
+from google.api_core.exceptions import (
+    FailedPrecondition,
+    InvalidArgument,
+    ResourceExhausted,
+    ServiceUnavailable,
+)
 from google.generativeai.types import FunctionDeclaration, Tool
 
 # Import our tools
@@ -18,6 +28,14 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.langchain_service.tools import bgb_solr_search, execute_bgb_sparql_query
 from backend.langchain_service.prompts import BGB_SYSTEM_PROMPT
 
+# The Batch API is only exposed by the google-genai SDK - it's optional
+try:
+    from google import genai as genai_sdk
+    BATCH_API_AVAILABLE = True
+except ImportError:
+    BATCH_API_AVAILABLE = False
+    genai_sdk = None
+
 # Try to import checkpointer - it's optional
 try:
     from backend.langchain_service.checkpointer import get_postgres_checkpointer, get_checkpointer_config
@@ -27,6 +45,108 @@ except ImportError:
     get_postgres_checkpointer = None
     get_checkpointer_config = None
 
+logger = logging.getLogger(__name__)
+
+# Lifetime of the Gemini context cache holding system prompt + tool declarations
+PROMPT_CACHE_TTL = datetime.timedelta(hours=1)
+
+# Wait before retrying cache creation after a transient error (rate limit,
+# outage, network); requests in between use the uncached model
+PROMPT_CACHE_RETRY = datetime.timedelta(minutes=1)
+
+# Context caches shared by all agent instances, keyed by (model_name, prompt hash).
+# A value of None marks a model for which caching is not available (e.g. the
+# prompt is below the model's minimum cacheable token count).
+_prompt_caches: Dict[tuple, Any] = {}
+
+# API key genai is currently configured with. genai.configure() drops the
+# cached gRPC clients, so it is only called again when the key changes.
+_configured_api_key: Optional[str] = None
+
+# Upper bound for model <-> tool round trips within one chat turn
+MAX_TOOL_ITERATIONS = 8
+
+# Sent along with the last tool results when the tool budget is used up or the
+# model repeats its calls, so it answers with what it has
+FINAL_ANSWER_PROMPT = (
+    "Beantworte die Frage jetzt ohne weitere Funktionsaufrufe "
+    "auf Grundlage der bisherigen Ergebnisse."
+)
+
+# Returned when the model produced no text answer at all
+NO_RESPONSE = "Keine Antwort generiert."
+
+# Runs independent tool calls requested in one model response concurrently
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bgb-tool")
+
+# Retry policy for rate limited / unavailable Gemini requests
+SEND_MAX_ATTEMPTS = 5
+SEND_BACKOFF_INITIAL = 0.5
+SEND_BACKOFF_MAX = 8.0
+
+# Terminal states of a Gemini batch job
+_BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"
+}
+
+# JSON schema type names for the Python annotations used in tool input models
+_PYTYPE_TO_JSON = {str: "string", int: "integer", float: "number", bool: "boolean", list: "array"}
+
+
+def _build_function_schemas() -> List[Dict[str, Any]]:
+    """Build the Gemini function schemas (name, description, parameters) of the LangChain tools."""
+    
+    # Use the already imported tools
+    tools = [bgb_solr_search, execute_bgb_sparql_query]
+    schemas = []
+    
+    for tool in tools:
+        # Extract parameters from the tool's args_schema (Pydantic model)
+        parameters = {"type": "object", "properties": {}, "required": []}
+        
+        if hasattr(tool, 'args_schema') and tool.args_schema:
+            # Read the Pydantic fields directly instead of materializing
+            # the full JSON schema
+            gemini_properties = {}
+            required = []
+            for field_name, field in tool.args_schema.model_fields.items():
+                gemini_properties[field_name] = {
+                    "type": _PYTYPE_TO_JSON.get(field.annotation, "string"),
+                    "description": field.description or ""
+                }
+                if field.is_required():
+                    required.append(field_name)
+
+            parameters["properties"] = gemini_properties
+            parameters["required"] = required
+        
+        schemas.append({
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": parameters
+        })
+    
+    return schemas
+
+
+# Tool name -> underlying tool function. The functions are called directly:
+# the model's arguments are passed as keywords, so LangChain's input
+# validation and callback handling in invoke() would only add overhead
+_TOOL_FUNCTIONS = {
+    tool.name: tool.func for tool in (bgb_solr_search, execute_bgb_sparql_query)
+}
+
+# The tool schemas are static, so they are built once at import time and
+# shared by all agent instances (treat as read-only)
+_FUNCTION_SCHEMAS = _build_function_schemas()
+
+
+def _response_parts(response) -> tuple:
+    """Return the content parts of the first candidate of a Gemini response."""
+    candidate = response.candidates[0] if response.candidates else None
+    return tuple(candidate.content.parts) if candidate and candidate.content else ()
+
+
 class GeminiAgentBGB:
     """
     BGB Agent using Google Gemini API with native function calling.
@@ -52,88 +172,124 @@ class GeminiAgentBGB:
         if not api_key:
             raise ValueError("Google API key is required. Set GOOGLE_API_KEY environment variable or pass api_key parameter.")
         
-        genai.configure(api_key=api_key)
+        global _configured_api_key
+        if api_key != _configured_api_key:
+            genai.configure(api_key=api_key)
+            _configured_api_key = api_key
         
+        self.api_key = api_key
+
         # Initialize the Gemini model with function calling support
+        self.function_schemas = _FUNCTION_SCHEMAS
         self.functions = self._convert_tools_to_gemini_functions()
+
         self.tools = [Tool(function_declarations=self.functions)]
-        
-        self.model = genai.GenerativeModel(
-            model_name=model_name,
-            tools=self.tools,
-            system_instruction=BGB_SYSTEM_PROMPT
-        )
+
+        self.model_name = model_name
+        # Built on the first chat() call, so constructing the agent (e.g. for
+        # an availability check) never creates a billable context cache
+        self.model = None
+        self._prompt_cache_expires = None
 
         # Initialize PostgresSaver for automatic persistence
         self.checkpointer = None
         if use_checkpointer:
             if not CHECKPOINTER_AVAILABLE:
-                print("⚠️ Warning: langgraph.checkpoint.postgres not available")
-                print("   Continuing without automatic persistence")
-                print("   To enable: pip install langgraph-checkpoint-postgres")
+                logger.warning(
+                    "langgraph.checkpoint.postgres not available, continuing without "
+                    "automatic persistence (pip install langgraph-checkpoint-postgres)"
+                )
             else:
                 try:
                     self.checkpointer = get_postgres_checkpointer()
-                    print("✅ PostgresSaver initialized for automatic persistence")
+                    logger.info("PostgresSaver initialized for automatic persistence")
                 except Exception as e:
-                    print(f"⚠️ Warning: Could not initialize PostgresSaver: {e}")
-                    print("   Continuing without automatic persistence")
+                    logger.warning(
+                        "Could not initialize PostgresSaver, continuing without "
+                        "automatic persistence: %s", e
+                    )
 
-    def _convert_tools_to_gemini_functions(self) -> List[FunctionDeclaration]:
-        """Convert LangChain tools to Gemini function declarations."""
-        
-        # Use the already imported tools
-        tools = [bgb_solr_search, execute_bgb_sparql_query]
-        functions = []
-        
-        for tool in tools:
-            # Extract parameters from the tool's args_schema (Pydantic model)
-            parameters = {"type": "object", "properties": {}, "required": []}
-            
-            if hasattr(tool, 'args_schema') and tool.args_schema:
-                schema = tool.args_schema.model_json_schema()
-                properties = schema.get('properties', {})
-                required = schema.get('required', [])
-                
-                # Convert Pydantic schema to Gemini format
-                gemini_properties = {}
-                for prop_name, prop_info in properties.items():
-                    gemini_properties[prop_name] = {
-                        "type": prop_info.get("type", "string"),
-                        "description": prop_info.get("description", "")
-                    }
-                
-                parameters["properties"] = gemini_properties
-                parameters["required"] = required
-            
-            # Create Gemini function declaration
-            function_declaration = FunctionDeclaration(
-                name=tool.name,
-                description=tool.description,
-                parameters=parameters
-            )
-            
-            functions.append(function_declaration)
-        
-        return functions
+    def _build_model(self) -> genai.GenerativeModel:
+        """
+        Create the Gemini model, backed by a context cache for the system prompt.
 
-    def _call_bgb_solr_search(self, german_query: str):
-        """Execute bgb_solr_search tool and return result."""
-        return bgb_solr_search.invoke({"german_query": german_query})
+        The cached content is billed once per PROMPT_CACHE_TTL instead of with
+        every request. Falls back to sending the system instruction per request
+        if the cache cannot be created: for good if the model or prompt does not
+        support caching, otherwise until PROMPT_CACHE_RETRY has passed.
+        """
+        cache_key = (self.model_name, hash(BGB_SYSTEM_PROMPT))
+        cached = _prompt_caches.get(cache_key, False)
 
-    def _call_execute_bgb_sparql_query(self, sparql_query: str, query_description: str):
-        """Execute execute_bgb_sparql_query tool and return result."""
-        return execute_bgb_sparql_query.invoke(
-            {"sparql_query": sparql_query, "query_description": query_description}
+        if cached is not None:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            try:
+                if cached is False or cached.expire_time <= now:
+                    cached = genai.caching.CachedContent.create(
+                        model=self.model_name,
+                        system_instruction=BGB_SYSTEM_PROMPT,
+                        tools=self.tools,
+                        ttl=PROMPT_CACHE_TTL,
+                    )
+                    _prompt_caches[cache_key] = cached
+                    logger.info("Created Gemini prompt cache %s", cached.name)
+                self._prompt_cache_expires = cached.expire_time
+                return genai.GenerativeModel.from_cached_content(cached_content=cached)
+            except (InvalidArgument, FailedPrecondition) as e:
+                # Model does not support caching or the prompt is too small
+                logger.info("Gemini prompt caching not available for %s: %s", self.model_name, e)
+                _prompt_caches[cache_key] = None
+            except Exception as e:
+                logger.warning(
+                    "Could not create Gemini prompt cache for %s, retrying in %s: %s",
+                    self.model_name, PROMPT_CACHE_RETRY, e
+                )
+                # chat() rebuilds the model once this time has passed
+                self._prompt_cache_expires = now + PROMPT_CACHE_RETRY
+                return self._build_uncached_model()
+
+        self._prompt_cache_expires = None
+        return self._build_uncached_model()
+
+    def _build_uncached_model(self) -> genai.GenerativeModel:
+        """Create the Gemini model sending the system instruction with every request."""
+        return genai.GenerativeModel(
+            model_name=self.model_name,
+            tools=self.tools,
+            system_instruction=BGB_SYSTEM_PROMPT
         )
 
+    def _send_with_backoff(self, chat, content):
+        """Send a message, retrying with exponential backoff on 429/503 errors."""
+        delay = SEND_BACKOFF_INITIAL
+        for attempt in range(1, SEND_MAX_ATTEMPTS + 1):
+            try:
+                return chat.send_message(content)
+            except (ResourceExhausted, ServiceUnavailable) as e:
+                if attempt == SEND_MAX_ATTEMPTS:
+                    raise
+                logger.warning(
+                    "Gemini request failed (attempt %d/%d), retrying in %.1fs: %s",
+                    attempt, SEND_MAX_ATTEMPTS, delay, e
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, SEND_BACKOFF_MAX)
+
+    def _convert_tools_to_gemini_functions(self) -> List[FunctionDeclaration]:
+        """Convert LangChain tools to Gemini function declarations."""
+        return [FunctionDeclaration(**schema) for schema in self.function_schemas]
+
     def get_function_by_name(self, function_name: str):
         """Get function by name for execution."""
-        function_map = {
-            "bgb_solr_search": self._call_bgb_solr_search,
-            "execute_bgb_sparql_query": self._call_execute_bgb_sparql_query,
-        }
-        return function_map.get(function_name)
+        return _TOOL_FUNCTIONS.get(function_name)
+
+    def _call_function(self, fn_name: str, fn_args: Dict[str, Any]) -> tuple:
+        """Run one tool call and return (result, error message or None)."""
+        try:
+            return self.get_function_by_name(fn_name)(**fn_args), None
+        except Exception as e:
+            logger.error("Error executing function %s: %s", fn_name, e)
+            return None, str(e)
 
     def chat(self, user_question: str, message_history: List[Dict[str, str]] = None, thread_id: str = None) -> Dict[str, Any]:
         """
@@ -150,7 +306,7 @@ class GeminiAgentBGB:
 
         # If checkpointer is enabled and thread_id provided, load from checkpointer
         if self.checkpointer and thread_id:
-            print(f"💾 Using PostgresSaver for thread: {thread_id}")
+            logger.info("Using PostgresSaver for thread: %s", thread_id)
             config = get_checkpointer_config(thread_id)
 
             # Load existing conversation state from checkpointer
@@ -162,15 +318,21 @@ class GeminiAgentBGB:
                     msg for msg in saved_messages
                     if msg.get("role") in ["user", "assistant", "model"]
                 ]
-                print(f"📜 Loaded {len(message_history)} messages from PostgresSaver")
+                logger.info("Loaded %d messages from PostgresSaver", len(message_history))
+
 
+        logger.info("Getting Gemini response...")
 
-        print("🔄 Getting Gemini response...")
+        # Build the model lazily, and refresh the prompt cache once it has expired
+        if self.model is None or (
+                self._prompt_cache_expires is not None and
+                self._prompt_cache_expires <= datetime.datetime.now(datetime.timezone.utc)):
+            self.model = self._build_model()
 
         # Convert message history to Gemini format if provided
         gemini_history = []
         if message_history:
-            print(f"📜 Loading {len(message_history)} messages from history...")
+            logger.info("Loading %d messages from history...", len(message_history))
             for msg in message_history:
                 role = msg.get("role", "user")
                 content = msg.get("content", "")
@@ -190,7 +352,7 @@ class GeminiAgentBGB:
         chat = self.model.start_chat(history=gemini_history)
         
         # Send new message
-        response = chat.send_message(user_question)
+        response = self._send_with_backoff(chat, user_question)
 
         messages = [
             {"role": "user", "content": user_question},
@@ -199,76 +361,113 @@ class GeminiAgentBGB:
         # Track function calls made
         function_calls_made = []
 
-        # Handle function calls in a loop
-        while True:
-            has_function_calls = False
-            
-            # Check each part of the response for function calls
-            if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
-                for part in response.candidates[0].content.parts:
-                    if hasattr(part, 'function_call') and part.function_call:
-                        has_function_calls = True
-                        fn_call = part.function_call
-                        fn_name = fn_call.name
-                        fn_args = dict(fn_call.args)
-
-                        print(f"🛠️ Calling function: {fn_name}")
-                        print(f"📋 Arguments: {fn_args}")
-
-                        # Execute the function
-                        try:
-                            fn_result = self.get_function_by_name(fn_name)(**fn_args)
-                            
-                            # Convert result to string if it's not already
-                            if isinstance(fn_result, (list, dict)):
-                                fn_result_str = json.dumps(fn_result, ensure_ascii=False)
-                            else:
-                                fn_result_str = str(fn_result)
-
-                            print(f"📊 Result: {fn_result_str[:150]}...")
-
-                            # Store function call info
-                            function_calls_made.append({
-                                "name": fn_name,
-                                "args": fn_args,
-                                "result": fn_result_str
-                            })
-
-                            # Send function result back to model
-                            # Create a function response using the genai.protos structure
-                            function_response = genai.protos.Part(
-                                function_response=genai.protos.FunctionResponse(
-                                    name=fn_name,
-                                    response={"result": fn_result_str}
-                                )
-                            )
-                            response = chat.send_message([function_response])
-                            
-                        except Exception as e:
-                            print(f"❌ Error executing function {fn_name}: {e}")
-                            # Send error response back to model
-                            error_response = genai.protos.Part(
-                                function_response=genai.protos.FunctionResponse(
-                                    name=fn_name,
-                                    response={"error": f"Fehler beim Ausführen der Funktion: {str(e)}"}
-                                )
-                            )
-                            response = chat.send_message([error_response])
-                        
-                        break  # Only handle one function call per iteration
-            
-            if not has_function_calls:
+        # Results of tool calls already executed in this turn, keyed by
+        # (name, normalized args), so repeated identical calls run only once
+        tool_results: Dict[tuple, Any] = {}
+        previous_call_keys = None
+        answer_now = False
+
+        # Handle function calls in a bounded loop; the extra iteration only
+        # inspects the reply to the last round of tool results
+        for iteration in range(MAX_TOOL_ITERATIONS + 1):
+            # Gemini may request several functions at once and expects a
+            # response part for each of them
+            fn_calls = [
+                part.function_call for part in _response_parts(response)
+                if getattr(part, 'function_call', None)
+            ]
+            if not fn_calls:
+                break
+            if answer_now:
+                # The model was asked for its final answer and still calls tools
+                logger.warning("Gemini kept calling tools after the final round, using best-effort answer")
                 break
 
-        # Add the final response to messages
-        final_text = response.text if response.text else "Keine Antwort generiert."
+            calls = []
+            for fn_call in fn_calls:
+                fn_args = dict(fn_call.args)
+                call_key = (fn_call.name, orjson.dumps(fn_args, option=orjson.OPT_SORT_KEYS, default=str))
+                calls.append((call_key, fn_call.name, fn_args))
+
+            # The model is repeating itself: answer the calls from the results
+            # of this turn and ask it to finish instead of spinning
+            call_keys = [call_key for call_key, _, _ in calls]
+            if call_keys == previous_call_keys:
+                logger.warning("Model repeated identical tool calls, asking for a final answer")
+                answer_now = True
+            previous_call_keys = call_keys
+            if iteration == MAX_TOOL_ITERATIONS - 1:
+                logger.warning("Gemini tool loop reached %d iterations, asking for a final answer", MAX_TOOL_ITERATIONS)
+                answer_now = True
+
+            # Independent, I/O-bound calls not answered earlier in this turn
+            # run concurrently
+            round_results = {}
+            futures = {}
+            for call_key, fn_name, fn_args in calls:
+                logger.info("Calling function: %s", fn_name)
+                logger.debug("Arguments: %s", fn_args)
+                if call_key in tool_results:
+                    logger.info("Reusing result of identical %s call", fn_name)
+                    round_results[call_key] = (tool_results[call_key], None)
+                elif call_key not in futures:
+                    futures[call_key] = _TOOL_EXECUTOR.submit(
+                        self._call_function, fn_name, fn_args
+                    )
+            for call_key, future in futures.items():
+                round_results[call_key] = future.result()
+                fn_result, error = round_results[call_key]
+                if error is None:
+                    tool_results[call_key] = fn_result
+
+            function_responses = []
+            for call_key, fn_name, fn_args in calls:
+                fn_result, error = round_results[call_key]
+
+                if error is None:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Result: %s...", str(fn_result)[:150])
+
+                    # Store function call info
+                    function_calls_made.append({
+                        "name": fn_name,
+                        "args": fn_args,
+                        "result": fn_result
+                    })
+
+                    # FunctionResponse.response is a protobuf Struct, so the
+                    # tool's list/dict/str result is passed through as-is
+                    # instead of being JSON-encoded into a string first.
+                    fn_response = {"result": fn_result}
+                else:
+                    # Send error response back to model
+                    fn_response = {"error": f"Fehler beim Ausführen der Funktion: {error}"}
+
+                function_responses.append(genai.protos.Part(
+                    function_response=genai.protos.FunctionResponse(
+                        name=fn_name,
+                        response=fn_response
+                    )
+                ))
+
+            if answer_now:
+                function_responses.append(genai.protos.Part(text=FINAL_ANSWER_PROMPT))
+
+            # Send all function results back to model in one message
+            response = self._send_with_backoff(chat, function_responses)
+
+        # Add the final response to messages; only the text parts are used, so
+        # a reply that still contains function calls yields its text (if any)
+        final_text = "".join(
+            part.text for part in _response_parts(response) if getattr(part, 'text', None)
+        ) or NO_RESPONSE
         messages.append({
             "role": "model", 
             "content": final_text,
             "function_calls": function_calls_made
         })
 
-        print("✅ Final response ready")
+        logger.info("Final response ready")
         
         # Save to checkpointer if enabled
         if self.checkpointer and thread_id:
@@ -288,9 +487,9 @@ class GeminiAgentBGB:
                     }
                 }
                 self.checkpointer.put(config, checkpoint_data, {})
-                print(f"💾 Conversation saved to PostgresSaver")
+                logger.info("Conversation saved to PostgresSaver")
             except Exception as e:
-                print(f"⚠️ Warning: Could not save to checkpointer: {e}")
+                logger.warning("Could not save to checkpointer: %s", e)
 
         return {
             "messages": messages,
@@ -298,6 +497,121 @@ class GeminiAgentBGB:
             "model": "gemini",
         }
 
+    def batch_chat(self, questions: List[str], poll_interval: float = 30.0) -> List[Dict[str, Any]]:
+        """
+        Answer independent questions through the Gemini Batch API.
+
+        Meant for non-interactive workloads such as evaluation or regression runs,
+        where batch pricing applies. Every round submits all open conversations as
+        one batch job; function calls in the results are executed locally and their
+        responses are sent in the next round.
+
+        Args:
+            questions: User questions, each answered in its own conversation
+            poll_interval: Seconds between batch job status polls
+
+        Returns:
+            One result dictionary per question, in the same order, shaped like chat()
+        """
+        if not BATCH_API_AVAILABLE:
+            raise ImportError(
+                "google-genai is not installed. Install it with: pip install google-genai"
+            )
+
+        client = genai_sdk.Client(api_key=self.api_key)
+        config = {
+            "system_instruction": BGB_SYSTEM_PROMPT,
+            "tools": [{"function_declarations": self.function_schemas}],
+        }
+
+        contents = [[{"role": "user", "parts": [{"text": q}]}] for q in questions]
+        function_calls_made: List[List[Dict[str, Any]]] = [[] for _ in questions]
+        final_texts: List[Optional[str]] = [None] * len(questions)
+        open_indices = list(range(len(questions)))
+
+        for round_number in range(1, MAX_TOOL_ITERATIONS + 2):
+            if not open_indices:
+                break
+
+            job = client.batches.create(
+                model=self.model_name,
+                src=[{"contents": contents[i], "config": config} for i in open_indices],
+                config={"display_name": f"bgb-batch-round-{round_number}"},
+            )
+            logger.info(
+                "Submitted batch job %s with %d requests (round %d)",
+                job.name, len(open_indices), round_number
+            )
+
+            while job.state.name not in _BATCH_DONE_STATES:
+                time.sleep(poll_interval)
+                job = client.batches.get(name=job.name)
+
+            if job.state.name != "JOB_STATE_SUCCEEDED":
+                raise RuntimeError(f"Gemini batch job {job.name} ended in state {job.state.name}")
+
+            still_open = []
+            for i, inlined in zip(open_indices, job.dest.inlined_responses):
+                response = inlined.response
+                if inlined.error:
+                    logger.error("Gemini batch request for question %d failed: %s", i, inlined.error)
+                    final_texts[i] = NO_RESPONSE
+                    continue
+                if response is None or not response.function_calls:
+                    final_texts[i] = (response.text if response else None) or NO_RESPONSE
+                    continue
+
+                if round_number > MAX_TOOL_ITERATIONS:
+                    # The model was asked for its final answer and still calls tools
+                    logger.warning(
+                        "Question %d kept calling tools after the final round, using best-effort answer", i
+                    )
+                    final_texts[i] = response.text or NO_RESPONSE
+                    continue
+
+                # Execute all requested functions and queue the responses
+                response_parts = []
+                for fn_call in response.function_calls:
+                    fn_args = dict(fn_call.args or {})
+                    try:
+                        fn_result = self.get_function_by_name(fn_call.name)(**fn_args)
+                        function_calls_made[i].append({
+                            "name": fn_call.name,
+                            "args": fn_args,
+                            "result": fn_result
+                        })
+                        fn_response = {"result": fn_result}
+                    except Exception as e:
+                        logger.error("Error executing function %s: %s", fn_call.name, e)
+                        fn_response = {"error": f"Fehler beim Ausführen der Funktion: {str(e)}"}
+                    response_parts.append(
+                        {"function_response": {"name": fn_call.name, "response": fn_response}}
+                    )
+                if round_number == MAX_TOOL_ITERATIONS:
+                    response_parts.append({"text": FINAL_ANSWER_PROMPT})
+
+                contents[i].append(response.candidates[0].content)
+                contents[i].append({"role": "user", "parts": response_parts})
+                still_open.append(i)
+
+            open_indices = still_open
+
+        return [
+            {
+                "messages": [
+                    {"role": "user", "content": question},
+                    {
+                        "role": "model",
+                        "content": final_texts[i],
+                        "function_calls": function_calls_made[i]
+                    },
+                ],
+                "final_response": final_texts[i],
+                "model": "gemini",
+            }
+            for i, question in enumerate(questions)
+        ]
+
     def _extract_final_response(self, messages: List[Dict]) -> str:
         """Extract the final user-facing response."""
         for message in reversed(messages):
@@ -316,6 +630,8 @@ def create_gemini_agent_bgb(api_key: str = None, model_name: str = "gemini-2.5-f
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     # Test the Gemini implementation
     print("🚀 Testing Gemini BGB Implementation")
     print("=" * 60)
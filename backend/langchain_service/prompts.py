@@ -16,6 +16,8 @@ Dein Kernziel ist es, Anfragen zum BGB präzise, objektiv und verständlich zu b
 - Klassen: bgb-onto:LegalCode, bgb-onto:Norm, bgb-onto:Paragraph, bgb-onto:LegalConcept
 - Eigenschaften: bgb-onto:hasNorm, bgb-onto:hasParagraph, bgb-onto:textContent, bgb-onto:defines
 - Namespaces: bgb-onto: <http://example.org/bgb/ontology/>, bgb-data: <http://example.org/bgb/data/>
+- URIs: Normen sind `bgb-data:norm_<Nummer>` (z.B. `bgb-data:norm_833` für § 833, `bgb-data:norm_1357a`), Absätze `bgb-data:norm_<Nummer>_para_<Absatz>`. Adressiere bekannte Normen direkt über ihre URI statt mit `FILTER(CONTAINS(STR(?norm), ...))`.
+- Mehrere Normen: Frage sie in **einer** Abfrage mit `VALUES ?norm { bgb-data:norm_833 bgb-data:norm_823 }` ab, statt je Norm eine eigene Abfrage zu senden.
 
 ## Anweisungen zum Arbeitsablauf
 
@@ -62,3 +64,7 @@ Dein Kernziel ist es, Anfragen zum BGB präzise, objektiv und verständlich zu b
     -   Füge keine abschließenden Zusammenfassungen bei kurzen oder mittellangen Antworten hinzu.
     -   Eine Zusammenfassung ist nur bei sehr langen (z.B. 5+ Absätze) und komplexen Antworten sinnvoll."""
 
+# Prebuilt system message for OpenAI-style chat APIs. It is always sent
+# byte-identical as the first message, so servers with prefix caching
+# (Ollama, vLLM) can reuse the KV cache of the prompt across requests.
+BGB_SYSTEM_MESSAGE = {"role": "system", "content": BGB_SYSTEM_PROMPT}
@@ -6,9 +6,17 @@ This implementation follows the official Qwen-Agent documentation patterns
 for function calling with proper message handling and response collection.
 """
 
-import json
-from typing import List, Dict, Any
-from qwen_agent.llm import get_chat_model
+import importlib.util
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
+import httpx
+import orjson
+
+# qwen-agent (and the openai client it pulls in) is imported when the first
+# agent talks to the model, so importing this module stays cheap
+QWEN_AGENT_AVAILABLE = importlib.util.find_spec("qwen_agent") is not None
 
 # Import our tools
 import sys
@@ -16,7 +24,92 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.langchain_service.tools import bgb_solr_search, execute_bgb_sparql_query
-from backend.langchain_service.prompts import BGB_SYSTEM_PROMPT
+from backend.langchain_service.prompts import BGB_SYSTEM_MESSAGE
+
+# Try to import checkpointer - it's optional
+try:
+    from backend.langchain_service.checkpointer import get_postgres_checkpointer, get_checkpointer_config
+    CHECKPOINTER_AVAILABLE = True
+except ImportError:
+    CHECKPOINTER_AVAILABLE = False
+    get_postgres_checkpointer = None
+    get_checkpointer_config = None
+
+# Semantic answer cache needs sentence-transformers - it's optional
+try:
+    from backend.langchain_service.semantic_cache import SemanticCache, SEMANTIC_CACHE_AVAILABLE
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+    SemanticCache = None
+
+logger = logging.getLogger(__name__)
+
+# generate_cfg options qwen-agent passes as keywords that the OpenAI v1 client
+# only accepts inside extra_body
+_OAI_EXTRA_BODY_PARAMS = ("top_k", "repetition_penalty")
+
+# Returned by _extract_final_response when the model produced no answer
+NO_RESPONSE = "No final response generated."
+
+# Runs independent tool calls from one model response concurrently
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bgb-tool")
+
+
+def _convert_tools_to_functions() -> List[Dict]:
+    """Convert LangChain tools to Qwen-Agent function format dynamically."""
+    
+    # Use the already imported tools
+    tools = [bgb_solr_search, execute_bgb_sparql_query]
+    functions = []
+    
+    for tool in tools:
+        # Extract function schema from LangChain tool
+        function_def = {
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": {
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        }
+        
+        # Extract parameters from the tool's args_schema (Pydantic model)
+        if hasattr(tool, 'args_schema') and tool.args_schema:
+            schema = tool.args_schema.model_json_schema()
+            properties = schema.get('properties', {})
+            required = schema.get('required', [])
+            
+            function_def["parameters"]["properties"] = properties
+            function_def["parameters"]["required"] = required
+        
+        functions.append(function_def)
+    
+    return functions
+
+
+@lru_cache(maxsize=1)
+def _get_semantic_cache() -> Optional["SemanticCache"]:
+    """Return the semantic cache shared by all agents, or None if sentence-transformers is missing."""
+    if not SEMANTIC_CACHE_AVAILABLE:
+        logger.warning(
+            "sentence-transformers not available, continuing without semantic cache "
+            "(pip install sentence-transformers)"
+        )
+        return None
+    return SemanticCache()
+
+
+# Tool name -> underlying tool function. The functions are called directly:
+# the model's arguments are passed as keywords, so LangChain's input
+# validation and callback handling in invoke() would only add overhead
+_TOOL_FUNCTIONS = {
+    tool.name: tool.func for tool in (bgb_solr_search, execute_bgb_sparql_query)
+}
+
+# The tool schemas are static, so they are converted once at import time and
+# shared by all agent instances (treat as read-only)
+_FUNCTIONS = _convert_tools_to_functions()
 
 
 class QwenAgentBGB:
@@ -30,6 +123,8 @@ class QwenAgentBGB:
         model_server: str = "http://localhost:11434/v1",
         use_checkpointer: bool = True,
         enable_thinking: bool = True,
+        http_client: Optional[httpx.Client] = None,
+        use_semantic_cache: bool = False,
     ):
         """
         Initialize the Qwen-Agent BGB assistant.
@@ -38,170 +133,240 @@ class QwenAgentBGB:
             model_server: OpenAI-compatible API endpoint (Ollama default)
             use_checkpointer: Whether to use PostgresSaver for automatic persistence
             enable_thinking: Whether to use Qwen's thinking mode for reasoning traces
+            http_client: Shared, connection-pooled HTTP client for the model server (optional)
+            use_semantic_cache: Whether to reuse answers to similar earlier questions
         """
 
-        # Initialize the Qwen model with function calling support
-        self.llm = get_chat_model(
-            {
-                "model": "qwen3:14B",  # This should match your Ollama model name
-                "model_server": model_server,
-                "api_key": "EMPTY",  # Ollama doesn't require real API key
-                "generate_cfg": {
-                    "extra_body": {
-                        "chat_template_kwargs": {"enable_thinking": enable_thinking}
-                    }
-                },
-            }
-        )
+        if not QWEN_AGENT_AVAILABLE:
+            raise ImportError("qwen-agent is not installed. Install it with: pip install qwen-agent")
+
+        # Qwen model config with function calling support; the model client is
+        # created on the first chat() call (see _ensure_llm)
+        self.llm = None
+        self._model_server = model_server
+        self._http_client = http_client
+        self._llm_cfg = {
+            "model": "qwen3:14B",  # This should match your Ollama model name
+            "model_server": model_server,
+            "api_key": "EMPTY",  # Ollama doesn't require real API key
+            "generate_cfg": {
+                "extra_body": {
+                    "chat_template_kwargs": {"enable_thinking": enable_thinking}
+                }
+            },
+        }
 
         self.enable_thinking = enable_thinking
 
-        # Convert LangChain tools to Qwen-Agent function format
-        self.functions = self._convert_tools_to_functions()
+        # LangChain tools in Qwen-Agent function format
+        self.functions = _FUNCTIONS
+
+        # Arguments shared by every model call; the same function list object
+        # is passed each time, so the serialized tool prompt stays identical.
+        # Only the final batch is used, so request it directly instead of
+        # letting qwen-agent build every intermediate streaming batch
+        self._chat_kwargs = {"functions": self.functions, "stream": False}
+
+        self.semantic_cache = _get_semantic_cache() if use_semantic_cache else None
 
         # Initialize PostgresSaver for automatic persistence
         self.checkpointer = None
-        if use_checkpointer:
+        if use_checkpointer and CHECKPOINTER_AVAILABLE:
             try:
                 self.checkpointer = get_postgres_checkpointer()
-                print("✅ PostgresSaver initialized for automatic persistence")
+                logger.info("PostgresSaver initialized for automatic persistence")
             except Exception as e:
-                print(f"⚠️ Warning: Could not initialize PostgresSaver: {e}")
-                print("   Continuing without automatic persistence")
+                logger.warning(
+                    "Could not initialize PostgresSaver, continuing without "
+                    "automatic persistence: %s", e
+                )
 
-    def _convert_tools_to_functions(self) -> List[Dict]:
-        """Convert LangChain tools to Qwen-Agent function format dynamically."""
-        
-        # Use the already imported tools
-        tools = [bgb_solr_search, execute_bgb_sparql_query]
-        functions = []
-        
-        for tool in tools:
-            # Extract function schema from LangChain tool
-            function_def = {
-                "name": tool.name,
-                "description": tool.description,
-                "parameters": {
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-            }
-            
-            # Extract parameters from the tool's args_schema (Pydantic model)
-            if hasattr(tool, 'args_schema') and tool.args_schema:
-                schema = tool.args_schema.model_json_schema()
-                properties = schema.get('properties', {})
-                required = schema.get('required', [])
-                
-                function_def["parameters"]["properties"] = properties
-                function_def["parameters"]["required"] = required
-            
-            functions.append(function_def)
-        
-        return functions
+    def _ensure_llm(self):
+        """Create the Qwen model client on first use."""
+        if self.llm is None:
+            from qwen_agent.llm import get_chat_model
 
-    def _call_bgb_solr_search(self, german_query: str):
-        """Execute bgb_solr_search tool and return result."""
-        return bgb_solr_search.invoke({"german_query": german_query})
+            self.llm = get_chat_model(self._llm_cfg)
+            self._bind_openai_client(self._model_server, self._http_client)
+        return self.llm
 
-    def _call_execute_bgb_sparql_query(self, sparql_query: str, query_description: str):
-        """Execute execute_bgb_sparql_query tool and return result."""
-        return execute_bgb_sparql_query.invoke(
-            {"sparql_query": sparql_query, "query_description": query_description}
-        )
+    def _bind_openai_client(self, model_server: str, http_client: Optional[httpx.Client]):
+        """
+        Reuse one OpenAI client for all completions of this agent.
+
+        qwen-agent's OAI backend builds a new openai.OpenAI client (and with it a
+        new connection pool) on every request. Routing the calls through a single
+        client, optionally on top of an injected httpx.Client, keeps connections
+        to the model server alive across iterations and requests.
+        """
+        import openai
+
+        client = openai.OpenAI(base_url=model_server, api_key="EMPTY", http_client=http_client)
+
+        # Same argument translation as the client factory it replaces
+        # (qwen_agent/llm/oai.py): OpenAI API v1 only accepts non-standard
+        # sampling options via extra_body and calls the timeout "timeout"
+        def _chat_complete_create(*args, **kwargs):
+            extra_params = {k: kwargs.pop(k) for k in _OAI_EXTRA_BODY_PARAMS if k in kwargs}
+            if extra_params:
+                kwargs["extra_body"] = {**kwargs.get("extra_body", {}), **extra_params}
+            if "request_timeout" in kwargs:
+                kwargs["timeout"] = kwargs.pop("request_timeout")
+            return client.chat.completions.create(*args, **kwargs)
+
+        self.llm._chat_complete_create = _chat_complete_create
 
     def get_function_by_name(self, function_name: str):
         """Get function by name for execution following Qwen-Agent documentation."""
-        function_map = {
-            "bgb_solr_search": self._call_bgb_solr_search,
-            "execute_bgb_sparql_query": self._call_execute_bgb_sparql_query,
-        }
-        return function_map.get(function_name)
-
+        return _TOOL_FUNCTIONS.get(function_name)
 
-    def chat(self, user_question: str, message_history: List[Dict[str, str]] = None) -> Dict[str, Any]:
+    def chat(
+        self,
+        user_question: str,
+        message_history: List[Dict[str, str]] = None,
+        thread_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Process a user question with function calling following Qwen-Agent documentation exactly.
 
         Args:
             user_question: User's question in German
             message_history: Previous messages in the conversation (optional)
+            thread_id: Thread ID for conversation persistence (optional)
 
         Returns:
-            if not (self.checkpointer and thread_id):  # Only log if not already logged
-                print(f"📜 Loading {len(message_history)} messages from history...")
+            Dictionary containing the conversation history and final response
         """
 
         # Initialize messages with system prompt
-        messages = [
-            {
-                "role": "system",
-                "content": BGB_SYSTEM_PROMPT,
-            },
-        ]
+        messages = [BGB_SYSTEM_MESSAGE]
 
         # Add message history if provided (for context-aware conversations)
         if message_history:
-            print(f"📜 Loading {len(message_history)} messages from history...")
+            logger.info("Loading %d messages from history...", len(message_history))
             messages.extend(message_history)
 
         # Add the new user question
         messages.append({"role": "user", "content": user_question})
 
-        # Process function calls following exact Qwen-Agent documentation pattern
-        print("🔄 Getting model response...")
-        responses = []
-        for responses in self.llm.chat(messages=messages, functions=self.functions):
-            pass
-        messages.extend(responses)
+        # Rephrasings of an earlier stand-alone question reuse its answer;
+        # answers within a conversation depend on the history and are not cached
+        use_semantic_cache = self.semantic_cache is not None and not message_history
+        cached_response = self._semantic_cache_get(user_question) if use_semantic_cache else None
 
-        # Check and apply function calls exactly as documented
-        # Save to checkpointer if enabled
+        if cached_response is not None:
+            messages.append({"role": "assistant", "content": cached_response})
+        else:
+            self._run_model(messages)
+
+        final_response = self._extract_final_response(messages)
+        if use_semantic_cache and cached_response is None and final_response != NO_RESPONSE:
+            self._semantic_cache_put(user_question, final_response)
+
+        # Save the complete conversation to checkpointer if enabled
         if self.checkpointer and thread_id:
             try:
                 config = get_checkpointer_config(thread_id)
                 checkpoint_data = {
                     "values": {
                         "messages": messages,
-                        "final_response": self._extract_final_response(messages),
+                        "final_response": final_response,
                     }
                 }
                 self.checkpointer.put(config, checkpoint_data, {})
-                print(f"💾 Conversation saved to PostgresSaver")
+                logger.info("Conversation saved to PostgresSaver")
             except Exception as e:
-                print(f"⚠️ Warning: Could not save to checkpointer: {e}")
+                logger.warning("Could not save to checkpointer: %s", e)
+
+        return {
+            "messages": messages,
+            "final_response": final_response,
+            "thinking_mode": self.enable_thinking,
+        }
 
+    def _run_model(self, messages: List[Dict]):
+        """Run the model/tool round trip, appending all new messages to messages."""
+        self._ensure_llm()
+
+        # Process function calls following exact Qwen-Agent documentation pattern
+        logger.info("Getting model response...")
+        responses = self.llm.chat(messages=messages, **self._chat_kwargs)
+        messages.extend(responses)
+
+        # Check and apply function calls exactly as documented
+        fn_calls = []
         for message in responses:
             if fn_call := message.get("function_call", None):
                 fn_name: str = fn_call['name']
-                fn_args: dict = json.loads(fn_call["arguments"])
-
-                print(f"🛠️ Calling function: {fn_name}")
-                print(f"📋 Arguments: {fn_args}")
+                fn_args: dict = orjson.loads(fn_call["arguments"])
+
+                logger.info("Calling function: %s", fn_name)
+                logger.debug("Arguments: %s", fn_args)
+                fn_calls.append((fn_name, fn_args))
+
+        # Without tool calls the first response already is the answer, and a
+        # second model call would only generate it again
+        if not fn_calls:
+            return
+
+        # Identical calls from the same response are sent to Solr/Blazegraph
+        # only once and their result is shared
+        call_keys = [
+            (fn_name, orjson.dumps(fn_args, option=orjson.OPT_SORT_KEYS, default=str))
+            for fn_name, fn_args in fn_calls
+        ]
+        unique_calls = dict(zip(call_keys, fn_calls))
+        if len(unique_calls) < len(fn_calls):
+            logger.info("Merged %d duplicate tool calls", len(fn_calls) - len(unique_calls))
+
+        # Tool calls are I/O-bound and independent, so several calls from the
+        # same response run concurrently; results keep the call order
+        if len(unique_calls) > 1:
+            futures = {
+                call_key: _TOOL_EXECUTOR.submit(self.get_function_by_name(fn_name), **fn_args)
+                for call_key, (fn_name, fn_args) in unique_calls.items()
+            }
+            unique_results = {call_key: future.result() for call_key, future in futures.items()}
+        else:
+            unique_results = {
+                call_key: self.get_function_by_name(fn_name)(**fn_args)
+                for call_key, (fn_name, fn_args) in unique_calls.items()
+            }
+        fn_results = [unique_results[call_key] for call_key in call_keys]
 
-                fn_res: str = json.dumps(self.get_function_by_name(fn_name)(**fn_args))
+        for (fn_name, _), fn_result in zip(fn_calls, fn_results):
+            # Text results (SPARQL) are passed through instead of being
+            # re-encoded as a JSON string literal
+            fn_res: str = fn_result if isinstance(fn_result, str) else orjson.dumps(fn_result).decode()
 
-                print(f"📊 Result: {fn_res[:150]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Result: %s...", fn_res[:150])
 
-                messages.append({
-                    "role": "function",
-                    "name": fn_name,
-                    "content": fn_res,
-                })
+            messages.append({
+                "role": "function",
+                "name": fn_name,
+                "content": fn_res,
+            })
 
         # Get final response
-        print("🔄 Getting final response...")
-        final_responses = []
-        for final_responses in self.llm.chat(messages=messages, functions=self.functions):
-            pass
+        logger.info("Getting final response...")
+        final_responses = self.llm.chat(messages=messages, **self._chat_kwargs)
         messages.extend(final_responses)
 
-        return {
-            "messages": messages,
-            "final_response": self._extract_final_response(messages),
-            "thinking_mode": self.enable_thinking,
-        }
+    def _semantic_cache_get(self, user_question: str) -> Optional[str]:
+        """Look up a cached answer; cache failures never fail the chat."""
+        try:
+            return self.semantic_cache.get(user_question)
+        except Exception as e:
+            logger.warning("Semantic cache lookup failed: %s", e)
+            return None
+
+    def _semantic_cache_put(self, user_question: str, final_response: str):
+        """Store an answer in the semantic cache."""
+        try:
+            self.semantic_cache.put(user_question, final_response)
+        except Exception as e:
+            logger.warning("Semantic cache update failed: %s", e)
 
     def _extract_final_response(self, messages: List[Dict]) -> str:
         """Extract the final user-facing response."""
@@ -212,15 +377,25 @@ class QwenAgentBGB:
                 and not message.get("function_call")
             ):
                 return message["content"]
-        return "No final response generated."
+        return NO_RESPONSE
 
 
-def create_qwen_agent_bgb(enable_thinking: bool = True):
+def create_qwen_agent_bgb(
+    enable_thinking: bool = True,
+    http_client: Optional[httpx.Client] = None,
+    use_semantic_cache: bool = False,
+):
     """Create a Qwen-Agent BGB assistant."""
-    return QwenAgentBGB(enable_thinking=enable_thinking)
+    return QwenAgentBGB(
+        enable_thinking=enable_thinking,
+        http_client=http_client,
+        use_semantic_cache=use_semantic_cache,
+    )
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     # Test the Qwen-Agent implementation
     print("🚀 Testing Qwen-Agent BGB Implementation")
     print("=" * 60)
@@ -246,6 +421,6 @@ if __name__ == "__main__":
         print(f"- Total messages: {len(result['messages'])}")
         print(f"- Thinking mode: {result['thinking_mode']}")
 
-    except (ConnectionError, TimeoutError, json.JSONDecodeError) as e:
+    except (ConnectionError, TimeoutError, orjson.JSONDecodeError) as e:
         print(f"❌ Error: {e}")
         print("Make sure Ollama is running and qwen3:14B model is available")
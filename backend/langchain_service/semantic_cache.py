@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Semantic answer cache for the BGB agents
+
+Repeated questions often differ only in phrasing. This cache embeds the
+question with a small multilingual sentence-transformers model and returns a
+previous answer when a cached question is similar enough (cosine similarity
+above a threshold), skipping the whole model/tool loop.
+
+sentence-transformers is optional; without it the cache is unavailable.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+# sentence-transformers (and numpy) are only needed for the cache - optional
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    np = None
+    SentenceTransformer = None
+    SEMANTIC_CACHE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# German-capable embedding model (384 dimensions)
+EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+# Minimum cosine similarity for a cached answer to be reused
+SIMILARITY_THRESHOLD = 0.92
+
+# Number of answers kept (least recently used are dropped first)
+CACHE_MAXSIZE = 512
+
+
+class SemanticCache:
+    """
+    LRU cache of answers keyed by question embeddings.
+
+    A few hundred normalized embeddings are searched with one matrix-vector
+    product, which is fast enough without an ANN index.
+    """
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL,
+        threshold: float = SIMILARITY_THRESHOLD,
+        maxsize: int = CACHE_MAXSIZE,
+    ):
+        if not SEMANTIC_CACHE_AVAILABLE:
+            raise ImportError(
+                "sentence-transformers is not installed. Install it with: pip install sentence-transformers"
+            )
+
+        self.model_name = model_name
+        self.threshold = threshold
+        self.maxsize = maxsize
+
+        self._model = None
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _embed(self, text: str):
+        """Return the normalized embedding of text, loading the model on first use."""
+        if self._model is None:
+            logger.info("Loading embedding model %s", self.model_name)
+            self._model = SentenceTransformer(self.model_name)
+        return self._model.encode(text, normalize_embeddings=True)
+
+    def get(self, question: str) -> Optional[str]:
+        """Return the answer of the most similar cached question, or None."""
+        embedding = self._embed(question)
+
+        with self._lock:
+            if not self._entries:
+                return None
+
+            keys = list(self._entries)
+            matrix = np.stack([self._entries[key][0] for key in keys])
+            similarities = matrix @ embedding
+            best = int(similarities.argmax())
+            if similarities[best] < self.threshold:
+                return None
+
+            key = keys[best]
+            self._entries.move_to_end(key)
+            logger.info("Semantic cache hit (similarity %.3f)", similarities[best])
+            return self._entries[key][1]
+
+    def put(self, question: str, answer: str):
+        """Store the answer to a question."""
+        embedding = self._embed(question)
+
+        with self._lock:
+            self._entries[question] = (embedding, answer)
+            self._entries.move_to_end(question)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached answers."""
+        with self._lock:
+            self._entries.clear()
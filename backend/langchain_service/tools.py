@@ -1,12 +1,141 @@
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
-import sys
-import os
+from typing import List, Dict, Any, Optional, Tuple
+from cachetools import TTLCache
+from itertools import islice
+import logging
+import threading
+import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Add the parent directory to the path to import project modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logger = logging.getLogger(__name__)
+
+# Tool results shared across agents, turns and threads: identical calls within
+# the TTL are answered from memory instead of hitting Solr/Blazegraph again
+TOOL_CACHE_MAXSIZE = 512
+TOOL_CACHE_TTL = 600  # seconds
+_tool_cache = TTLCache(maxsize=TOOL_CACHE_MAXSIZE, ttl=TOOL_CACHE_TTL)
+_tool_cache_lock = threading.Lock()
+_tool_cache_stats = {"hits": 0, "misses": 0}
+
+# Model-generated search queries are cut to this length; longer inputs are
+# not meaningful searches and would only produce costly queries/cache keys
+SOLR_QUERY_MAX_CHARS = 300
+
+# Backslash-escapes Solr query syntax so the query is searched literally
+_SOLR_ESCAPE_TABLE = str.maketrans({c: "\\" + c for c in '+-&|!(){}[]^"~*?:\\/'})
+
+# Length of the text snippets returned by bgb_solr_search (see the
+# text_content_snippet copy field in kg_search_index/configure_solr.py)
+SNIPPET_MAX_CHARS = 300
+
+# Fields searched by bgb_solr_search; direct norm number matches rank highest
+SOLR_QUERY_FIELDS = "label^3 title^2 text_content norm_number^4"
+
+SOLR_CORE_URL = "http://localhost:8984/solr/bgb_core"
+SOLR_SELECT_URL = f"{SOLR_CORE_URL}/select"
+SPARQL_ENDPOINT = "http://localhost:9999/bigdata/sparql"
+
+# Request parts that are the same for every tool call
+_SOLR_STATIC_PARAMS = {
+    # edismax parses the query once and searches the boosted fields itself
+    "defType": "edismax",
+    "qf": SOLR_QUERY_FIELDS,
+    "mm": "1",
+    "wt": "json",
+    "omitHeader": "true",
+    # Only the fields used for the tool output; the snippet field holds
+    # the first SNIPPET_MAX_CHARS + 1 characters of text_content
+    "fl": "uri,label,title,text_content_snippet,score",
+    "sort": "score desc",
+}
+_SPARQL_HEADERS = {"Accept": "application/sparql-results+json"}
+
+# Connect timeouts are short so an unreachable service fails fast; SPARQL
+# keeps a longer read timeout for expensive model-generated queries
+SOLR_TIMEOUT = (3, 10)  # seconds (connect, read)
+SPARQL_TIMEOUT = (3, 30)  # seconds (connect, read)
+
+# After a connection failure, calls to that service fail immediately for
+# this long instead of every tool call waiting for its own timeout
+BACKEND_RETRY_AFTER = 15  # seconds
+_backend_down_until = {"solr": 0.0, "blazegraph": 0.0}
+_backend_lock = threading.Lock()
+
+# Keep-alive connections to Solr and Blazegraph shared by all tool calls,
+# including concurrent ones from the agents' tool executors. Solr searches are
+# sent as form-encoded POSTs (no URL length limit for long queries) and, being
+# read-only, are retried briefly on connection errors and gateway/unavailable
+# responses; SPARQL POSTs are not retried (urllib3 default).
+_http_session = requests.Session()
+_http_session.mount(
+    "http://",
+    HTTPAdapter(pool_connections=1, pool_maxsize=16),
+)
+_http_session.mount(
+    SOLR_CORE_URL,
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.1,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+        ),
+    ),
+)
+
+
+def _cache_get(key: Tuple) -> Optional[Any]:
+    """Return a cached tool result or None."""
+    with _tool_cache_lock:
+        value = _tool_cache.get(key)
+        _tool_cache_stats["hits" if value is not None else "misses"] += 1
+        return value
+
+
+def _cache_put(key: Tuple, value: Any):
+    """Store a successful tool result."""
+    with _tool_cache_lock:
+        _tool_cache[key] = value
+
+
+def tool_cache_stats() -> Dict[str, int]:
+    """Return hit/miss counters and the current size of the tool result cache."""
+    with _tool_cache_lock:
+        return {**_tool_cache_stats, "size": len(_tool_cache)}
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Shorten text to limit characters, marking cut text with '...'."""
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+
+def _first_value(value: Any, default: str = "") -> Any:
+    """Return the first entry of a multi-valued Solr field, or the value itself."""
+    if isinstance(value, list):
+        return value[0] if value else default
+    return default if value is None else value
+
+
+def _backend_down(name: str) -> bool:
+    """Return True while a recent connection failure to the service is remembered."""
+    return time.monotonic() < _backend_down_until[name]
+
+
+def _mark_backend_down(name: str):
+    """Remember a connection failure so calls skip the service for a while."""
+    with _backend_lock:
+        _backend_down_until[name] = time.monotonic() + BACKEND_RETRY_AFTER
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize case and whitespace; Solr's German analyzer ignores both."""
+    return " ".join(query.lower().split())
 
 
 class BGBSolrSearchInput(BaseModel):
@@ -37,67 +166,53 @@ def _search_solr(query: str, max_results: int = 5) -> List[Dict[str, Any]]:
     Returns:
         List of search results
     """
-    solr_url = "http://localhost:8984/solr/bgb_core"
-    select_url = f"{solr_url}/select"
-    
-    # Build Solr query - search across multiple text fields
-    text_fields = ["label", "title", "text_content", "norm_number"]
-    field_queries = [f"{field}:({query})" for field in text_fields]
-    solr_query = " OR ".join(field_queries)
-    
+    if _backend_down("solr"):
+        return _solr_error_result()
+
     params = {
-        "q": solr_query,
-        "wt": "json",
+        **_SOLR_STATIC_PARAMS,
+        "q": query.translate(_SOLR_ESCAPE_TABLE),
         "rows": max_results,
-        "fl": "id,uri,type,label,title,norm_number,paragraph_number,text_content,score",
-        "sort": "score desc",
     }
     
     try:
-        response = requests.get(select_url, params=params, timeout=10)
+        response = _http_session.post(SOLR_SELECT_URL, data=params, timeout=SOLR_TIMEOUT)
         response.raise_for_status()
         
-        result = response.json()
-        docs = result.get("response", {}).get("docs", [])
-
-        # Format for tool output
-        formatted_results = []
-        for doc in docs:
-            # Extract values from arrays if needed
-            uri_raw = doc.get("uri", ["no uri"])
-            uri = uri_raw[0] if isinstance(uri_raw, list) else uri_raw
-            
-            label_raw = doc.get("label")
-            label = label_raw[0] if isinstance(label_raw, list) and label_raw else ""
-            
-            title_raw = doc.get("title")  
-            title = title_raw[0] if isinstance(title_raw, list) and title_raw else ""
-            
-            text_content_raw = doc.get("text_content")
-            text_content = text_content_raw[0] if isinstance(text_content_raw, list) and text_content_raw else ""
-            
-            # Create formatted result
-            formatted_result = {
-                "id": uri,
-                "title": title or label,
-                "snippet": text_content[:300] + "..." if len(text_content) > 300 else text_content,
-                "score": doc.get("score", 0)
+        result = orjson.loads(response.content)
+        try:
+            docs = result["response"]["docs"]
+        except KeyError:
+            docs = []
+
+        # Format for tool output; multi-valued fields are unwrapped to their
+        # first value (no highlighting is requested, so there is none to merge)
+        return [
+            {
+                "id": _first_value(doc.get("uri"), "no uri"),
+                "title": _first_value(doc.get("title")) or _first_value(doc.get("label")),
+                "snippet": _truncate(_first_value(doc.get("text_content_snippet")), SNIPPET_MAX_CHARS),
+                "score": doc.get("score", 0),
             }
-            formatted_results.append(formatted_result)
-            
-        return formatted_results
+            for doc in docs
+        ]
         
-    except requests.RequestException as e:
-        error_msg = f"Error connecting to Solr: {e}"
-        print(error_msg)
-        # Return error information instead of mock data
-        return [{
-            "id": "error",
-            "title": "Solr-Suchfehler",
-            "snippet": f"Verbindung zu Solr-Service fehlgeschlagen. Überprüfen Sie, ob Solr auf localhost:8984 läuft.",
-            "score": 0,
-            "error": True
-        }]
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        if isinstance(e, requests.ConnectionError):
+            _mark_backend_down("solr")
+        logger.warning("Error connecting to Solr: %s", e)
+        return _solr_error_result()
+
+
+def _solr_error_result() -> List[Dict[str, Any]]:
+    """Error information returned instead of mock data when Solr fails."""
+    return [{
+        "id": "error",
+        "title": "Solr-Suchfehler",
+        "snippet": f"Verbindung zu Solr-Service fehlgeschlagen. Überprüfen Sie, ob Solr auf localhost:8984 läuft.",
+        "score": 0,
+        "error": True
+    }]
 
 
 def _execute_sparql_query(sparql_query: str, query_description: str) -> str:
@@ -111,40 +226,51 @@ def _execute_sparql_query(sparql_query: str, query_description: str) -> str:
     Returns:
         Formatted results of the SPARQL query execution
     """
-    blazegraph_url = "http://localhost:9999/bigdata"
-    sparql_endpoint = f"{blazegraph_url}/sparql"
-    
+    # The bindings only depend on the query; the description is only used
+    # for formatting, so it is not part of the cache key
+    cache_key = ("sparql_bindings", sparql_query)
+    bindings = _cache_get(cache_key)
+
     try:
-        response = requests.post(
-            sparql_endpoint,
-            data={"query": sparql_query},
-            headers={"Accept": "application/sparql-results+json"},
-            timeout=30,
-        )
-        response.raise_for_status()
-        
-        result = response.json()
-        bindings = result.get("results", {}).get("bindings", [])
-        
+        if bindings is None:
+            if _backend_down("blazegraph"):
+                return f"SPARQL-Fehler: Blazegraph war vor Kurzem nicht erreichbar (erneuter Versuch in höchstens {BACKEND_RETRY_AFTER} Sekunden). Überprüfen Sie, ob der Service auf localhost:9999 läuft."
+            response = _http_session.post(
+                SPARQL_ENDPOINT,
+                data={"query": sparql_query},
+                headers=_SPARQL_HEADERS,
+                timeout=SPARQL_TIMEOUT,
+            )
+            response.raise_for_status()
+
+            result = orjson.loads(response.content)
+            try:
+                bindings = result["results"]["bindings"]
+            except KeyError:
+                bindings = []
+            _cache_put(cache_key, bindings)
+        else:
+            logger.info("TOOL RESULT (cached): SPARQL bindings reused")
+
         if bindings:
-            # Format results in a readable way
-            formatted_result = f"SPARQL-Ergebnisse für '{query_description}' ({len(bindings)} Treffer):\n"
+            # Format results in a readable way, joined once at the end
+            parts = [f"SPARQL-Ergebnisse für '{query_description}' ({len(bindings)} Treffer):\n"]
             
             # Process each result binding
-            for i, binding in enumerate(bindings[:10], 1):  # Limit to first 10 results
-                formatted_result += f"\n--- Ergebnis {i} ---\n"
-                for var, value in binding.items():
-                    var_value = value.get("value", "")
-                    formatted_result += f"{var}: {var_value}\n"
+            for i, binding in enumerate(islice(bindings, 10), 1):  # Limit to first 10 results
+                parts.append(f"\n--- Ergebnis {i} ---\n")
+                parts.extend(f"{var}: {value.get('value', '')}\n" for var, value in binding.items())
             
             if len(bindings) > 10:
-                formatted_result += f"\n... und {len(bindings) - 10} weitere Ergebnisse (zeige erste 10)"
+                parts.append(f"\n... und {len(bindings) - 10} weitere Ergebnisse (zeige erste 10)")
             
-            return formatted_result
+            return "".join(parts)
         else:
             return f"SPARQL-Ergebnisse: Keine Treffer für '{query_description}'. Abfrage möglicherweise zu spezifisch oder Entity existiert nicht in der Wissensbasis."
             
     except requests.RequestException as e:
+        if isinstance(e, requests.ConnectionError):
+            _mark_backend_down("blazegraph")
         return f"SPARQL-Fehler: Verbindung zu Blazegraph fehlgeschlagen. Überprüfen Sie, ob der Service auf localhost:9999 läuft. Details: {str(e)}"
     except (ValueError, KeyError, TypeError) as e:
         return f"SPARQL-Verarbeitungsfehler: Ungültige Syntax oder JSON-Parsing-Problem. Details: {str(e)}"
@@ -167,13 +293,23 @@ def bgb_solr_search(german_query: str) -> List[Dict[str, Any]]:
         - snippet: Relevanter Inhaltsausschnitt
         - score: Relevanz-Score
     """
-    print(f"🔍 TOOL CALL: bgb_solr_search with query: '{german_query}'")
+    logger.info("TOOL CALL: bgb_solr_search with query: '%s'", german_query)
+    german_query = german_query[:SOLR_QUERY_MAX_CHARS]
     
+    cache_key = ("bgb_solr_search", _normalize_query(german_query))
+    result = _cache_get(cache_key)
+    if result is not None:
+        logger.info("TOOL RESULT (cached): %d articles", len(result))
+        return result
+
     result = _search_solr(german_query)
+    if not any(article.get("error") for article in result):
+        _cache_put(cache_key, result)
     
-    print(f"🔍 TOOL RESULT: Found {len(result)} articles")
-    for article in result:
-        print(f"  - {article['id']}: {article['title']} (Score: {article.get('score', 'N/A')})")
+    logger.info("TOOL RESULT: Found %d articles", len(result))
+    if logger.isEnabledFor(logging.DEBUG):
+        for article in result:
+            logger.debug("  - %s: %s (Score: %s)", article["id"], article["title"], article.get("score", "N/A"))
     
     return result
 
@@ -195,6 +331,10 @@ def execute_bgb_sparql_query(sparql_query: str, query_description: str) -> str:
     
     Häufige Klassen: bgb-onto:LegalCode, bgb-onto:Norm, bgb-onto:Paragraph, bgb-onto:LegalConcept
     Häufige Eigenschaften: bgb-onto:hasNorm, bgb-onto:hasParagraph, bgb-onto:textContent, bgb-onto:defines
+    Normen haben feste URIs (z.B. bgb-data:norm_833 für § 833) und sollten direkt adressiert
+    werden statt per FILTER(CONTAINS(STR(?norm), ...)) über alle Normen zu filtern.
+    Mehrere Normen in einer Abfrage mit VALUES zusammenfassen, z.B.
+    VALUES ?norm { bgb-data:norm_833 bgb-data:norm_823 }, statt eine Abfrage pro Norm.
     
     Args:
         sparql_query: Vollständige SPARQL-Abfrage zur Ausführung (muss Präfixe enthalten)
@@ -203,14 +343,17 @@ def execute_bgb_sparql_query(sparql_query: str, query_description: str) -> str:
     Returns:
         Formatierte Ergebnisse der SPARQL-Abfrage-Ausführung mit allen gefundenen Bindungen
     """
-    print("🔎 TOOL CALL: execute_bgb_sparql_query")
-    print(f"📝 Query Description: {query_description}")
-    print(f"🔍 SPARQL Query: {sparql_query[:200]}...")
+    logger.info("TOOL CALL: execute_bgb_sparql_query - %s", query_description)
+    logger.debug("SPARQL Query: %.200s", sparql_query)
     
     result = _execute_sparql_query(sparql_query, query_description)
     
-    print("🔎 TOOL RESULT: SPARQL query executed")
+    logger.info("TOOL RESULT: SPARQL query executed")
     return result
 
 
-
+__all__ = [
+    "bgb_solr_search",
+    "execute_bgb_sparql_query",
+    "tool_cache_stats",
+]
@@ -3,7 +3,8 @@
 Test script for BGB AI Chat API
 Run this after starting the API to verify it's working correctly.
 """
-import requests
+import asyncio
+import httpx
 import json
 import sys
 from uuid import UUID
@@ -16,27 +17,27 @@ HEADERS = {
 }
 
 
-def test_health():
+async def test_health(client):
     """Test health endpoint"""
     print("🏥 Testing health endpoint...")
-    response = requests.get(f"{API_BASE_URL}/healthz")
+    response = await client.get("/healthz")
     assert response.status_code == 200
     print(f"   ✅ Health: {response.json()['status']}")
 
 
-def test_readiness():
+async def test_readiness(client):
     """Test readiness endpoint"""
     print("🔍 Testing readiness endpoint...")
-    response = requests.get(f"{API_BASE_URL}/readyz")
+    response = await client.get("/readyz")
     assert response.status_code == 200
     data = response.json()
     print(f"   ✅ Ready: {data['ready']}, Checks: {data['checks']}")
 
 
-def test_list_agents():
+async def test_list_agents(client):
     """Test listing agents"""
     print("🤖 Testing agent listing...")
-    response = requests.get(f"{API_BASE_URL}/api/v1/agents", headers=HEADERS)
+    response = await client.get("/api/v1/agents")
     assert response.status_code == 200
     agents = response.json()['agents']
     print(f"   ✅ Found {len(agents)} agents:")
@@ -45,12 +46,11 @@ def test_list_agents():
         print(f"      {status} {agent['name']}: {agent['description']}")
 
 
-def test_create_thread():
+async def test_create_thread(client):
     """Test creating a thread"""
     print("📝 Testing thread creation...")
-    response = requests.post(
-        f"{API_BASE_URL}/api/v1/threads",
-        headers=HEADERS,
+    response = await client.post(
+        "/api/v1/threads",
         json={
             "title": "Test Thread",
             "metadata": {"test": True}
@@ -63,51 +63,47 @@ def test_create_thread():
     return thread_id
 
 
-def test_get_thread(thread_id):
+async def test_get_thread(client, thread_id):
     """Test getting a thread"""
     print("📖 Testing thread retrieval...")
-    response = requests.get(
-        f"{API_BASE_URL}/api/v1/threads/{thread_id}",
-        headers=HEADERS
+    response = await client.get(
+        f"/api/v1/threads/{thread_id}"
     )
     assert response.status_code == 200
     thread = response.json()
     print(f"   ✅ Retrieved thread: {thread['title']}")
 
 
-def test_list_threads():
+async def test_list_threads(client):
     """Test listing threads"""
     print("📚 Testing thread listing...")
-    response = requests.get(
-        f"{API_BASE_URL}/api/v1/threads?limit=10",
-        headers=HEADERS
+    response = await client.get(
+        "/api/v1/threads?limit=10"
     )
     assert response.status_code == 200
     threads = response.json()['threads']
     print(f"   ✅ Found {len(threads)} threads")
 
 
-def test_list_messages(thread_id):
+async def test_list_messages(client, thread_id):
     """Test listing messages"""
     print("💬 Testing message listing...")
-    response = requests.get(
-        f"{API_BASE_URL}/api/v1/threads/{thread_id}/messages",
-        headers=HEADERS
+    response = await client.get(
+        f"/api/v1/threads/{thread_id}/messages"
     )
     assert response.status_code == 200
     messages = response.json()['messages']
     print(f"   ✅ Found {len(messages)} messages")
 
 
-def test_send_message_non_stream(thread_id):
+async def test_send_message_non_stream(client, thread_id):
     """Test sending a message (non-streaming)"""
     print("✉️  Testing message send (non-streaming)...")
     print("   ⏳ This may take a moment as it calls the agent...")
 
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/api/v1/threads/{thread_id}/messages",
-            headers=HEADERS,
+        response = await client.post(
+            f"/api/v1/threads/{thread_id}/messages",
             json={
                 "agent": "qwen",
                 "input": "Was ist § 1 BGB?",
@@ -129,56 +125,67 @@ def test_send_message_non_stream(thread_id):
             print(f"   ⚠️  Message send returned status {response.status_code}")
             print(f"      Error: {response.text}")
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         print(f"   ⚠️  Message send timed out (this is normal if agent takes long)")
     except Exception as e:
         print(f"   ⚠️  Message send error: {e}")
 
 
-def test_delete_thread(thread_id):
+async def test_delete_thread(client, thread_id):
     """Test deleting a thread"""
     print("🗑️  Testing thread deletion...")
-    response = requests.delete(
-        f"{API_BASE_URL}/api/v1/threads/{thread_id}",
-        headers=HEADERS
+    response = await client.delete(
+        f"/api/v1/threads/{thread_id}"
     )
     assert response.status_code == 204
     print(f"   ✅ Thread deleted")
 
 
-def main():
-    """Run all tests"""
-    print("=" * 60)
-    print("🧪 BGB AI Chat API - Integration Tests")
-    print("=" * 60)
-    print()
-
-    try:
-        # Basic health checks
-        test_health()
-        test_readiness()
-        print()
-
-        # Agent info
-        test_list_agents()
+async def run_tests():
+    """Run all tests over one shared client"""
+    async with httpx.AsyncClient(
+        http2=True,
+        base_url=API_BASE_URL,
+        headers=HEADERS,
+        timeout=60,
+    ) as client:
+        # Basic health checks and agent info (independent, run concurrently)
+        await asyncio.gather(
+            test_health(client),
+            test_readiness(client),
+            test_list_agents(client),
+        )
         print()
 
         # Thread operations
-        thread_id = test_create_thread()
-        test_get_thread(thread_id)
-        test_list_threads()
+        thread_id = await test_create_thread(client)
+        await asyncio.gather(
+            test_get_thread(client, thread_id),
+            test_list_threads(client),
+            test_list_messages(client, thread_id),
+        )
         print()
 
         # Message operations
-        test_list_messages(thread_id)
-        test_send_message_non_stream(thread_id)
-        test_list_messages(thread_id)  # Should have messages now
+        await test_send_message_non_stream(client, thread_id)
+        await test_list_messages(client, thread_id)  # Should have messages now
         print()
 
         # Cleanup
-        test_delete_thread(thread_id)
+        await test_delete_thread(client, thread_id)
         print()
 
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("🧪 BGB AI Chat API - Integration Tests")
+    print("=" * 60)
+    print()
+
+    try:
+        asyncio.run(run_tests())
+
         print("=" * 60)
         print("✅ All tests passed!")
         print("=" * 60)
@@ -187,7 +194,7 @@ def main():
     except AssertionError as e:
         print(f"\n❌ Test failed: {e}")
         return 1
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print(f"\n❌ Connection error: Is the API running at {API_BASE_URL}?")
         return 1
     except Exception as e: